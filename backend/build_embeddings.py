@@ -0,0 +1,80 @@
+"""
+build_embeddings.py -- Precompute the LEGAL_CHUNKS embeddings for the RAG store.
+Run once after editing knowledge_base.LEGAL_CHUNKS (or at image build time):
+
+    python build_embeddings.py          # FP32 model
+    python build_embeddings.py --int8   # quantize, check retrieval, embed with int8
+
+Writes legal_embeddings.npz, which main._load_chunk_vecs loads instead of
+running the ONNX encoder over every chunk on each server start. With --int8,
+also writes model.int8.onnx next to Chroma's cached model; serve it with
+NYAYA_EMBED_INT8=true. Quantize on the same CPU family you serve on: the
+weights use the full int8 range only when the build host has VNNI. The
+build fails if quantization changes the top-4 chunks for any probe query.
+"""
+import sys
+
+import numpy as np
+
+from embeddings import NyayaEmbeddingFunction
+from knowledge_base import EMBEDDINGS_PATH, LEGAL_TEXTS, save_embeddings
+
+PROBE_QUERIES = [
+    "I applied for a ration card months ago and the food office gives no answer",
+    "how do I file an RTI application and what is the fee",
+    "my husband beats me and his family demands more dowry",
+    "my in-laws threw me out of the house and took my jewellery",
+    "we both want a mutual consent divorce, what is the procedure",
+    "my wife left two years ago, can I get divorce for desertion",
+]
+
+
+def _top(chunk_vecs, query_vecs, k: int = 4) -> list[list[int]]:
+    chunks = np.asarray(chunk_vecs, dtype=np.float32)
+    queries = np.asarray(query_vecs, dtype=np.float32)
+    chunks /= np.linalg.norm(chunks, axis=1, keepdims=True)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return [sorted(np.argsort(-row)[:k]) for row in queries @ chunks.T]
+
+
+def _has_vnni() -> bool:
+    """True if this CPU has VNNI int8 dot products (Linux only; else assume not)."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return "avx512_vnni" in flags or "avx_vnni" in flags
+
+
+def _quantize(fp32: NyayaEmbeddingFunction) -> None:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    fp32._download_model_if_not_exists()
+    # Without VNNI, ORT's AVX2 u8*s8 kernels can saturate on full-range
+    # weights; 7-bit weights avoid that at a small precision cost.
+    quantize_dynamic(
+        fp32.model_path(False),
+        fp32.model_path(True),
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=["MatMul", "Gemm"],
+        reduce_range=not _has_vnni(),
+    )
+
+
+embed_fn = NyayaEmbeddingFunction(int8=False)
+
+if "--int8" in sys.argv[1:]:
+    _quantize(embed_fn)
+    int8_fn = NyayaEmbeddingFunction(int8=True)
+    fp32_top = _top(embed_fn(LEGAL_TEXTS), embed_fn(PROBE_QUERIES))
+    int8_top = _top(int8_fn(LEGAL_TEXTS), int8_fn(PROBE_QUERIES))
+    shifted = [q for q, a, b in zip(PROBE_QUERIES, fp32_top, int8_top) if a != b]
+    if shifted:
+        sys.exit("int8 model changes top-4 retrieval for: " + "; ".join(shifted))
+    print(f"int8 model OK on {len(PROBE_QUERIES)} probe queries")
+    embed_fn = int8_fn
+
+vectors = embed_fn(LEGAL_TEXTS)
+save_embeddings(vectors, embed_fn.model_tag)
+print(f"Wrote {len(vectors)} {embed_fn.model_tag} embeddings -> {EMBEDDINGS_PATH}")
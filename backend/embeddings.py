@@ -0,0 +1,73 @@
+"""
+embeddings.py — Project Nyaya
+ONNX MiniLM-L6-v2 embedding function shared by the RAG store (main.py) and
+build_embeddings.py, with ONNX Runtime tuned for a small CPU-bound encoder
+running next to the event loop.
+
+Environment:
+  NYAYA_EMBED_DEVICE  cpu (default) | cuda | coreml | dml
+                      Falls back to CPU when the provider is not installed.
+  NYAYA_EMBED_INTRA   intra-op threads for one forward pass (default 2)
+  NYAYA_EMBED_INT8    true to use the int8 model written by
+                      `python build_embeddings.py --int8` (default false)
+"""
+
+import os
+from functools import cached_property
+
+from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+INT8_MODEL_FILE = "model.int8.onnx"
+
+_PROVIDER_MAP: dict[str, list[str]] = {
+    "cpu": [],
+    "cuda": ["CUDAExecutionProvider"],
+    "coreml": ["CoreMLExecutionProvider"],
+    "dml": ["DmlExecutionProvider"],
+}
+
+
+def _resolve_providers(available: list[str], device: str) -> list[str]:
+    """Requested accelerator (if present on this host) followed by CPU."""
+    wanted = [p for p in _PROVIDER_MAP.get(device.lower(), []) if p in available]
+    return wanted + ["CPUExecutionProvider"]
+
+
+class NyayaEmbeddingFunction(ONNXMiniLM_L6_V2):
+    """
+    ONNXMiniLM_L6_V2 with full graph optimisation and a pinned thread pool,
+    optionally running the dynamically quantized int8 copy of the model.
+    """
+
+    def __init__(self, int8: bool | None = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        if int8 is None:
+            int8 = os.getenv("NYAYA_EMBED_INT8", "false").lower() == "true"
+        # Quietly stay on FP32 until the quantized file has been built.
+        self.int8 = int8 and os.path.exists(self.model_path(True))
+
+    def model_path(self, int8: bool = False) -> str:
+        name = INT8_MODEL_FILE if int8 else "model.onnx"
+        return os.path.join(self.DOWNLOAD_PATH, self.EXTRACTED_FOLDER_NAME, name)
+
+    @property
+    def model_tag(self) -> str:
+        """Identifies the weights in use; stored embeddings are keyed on it."""
+        return self.MODEL_NAME + ("-int8" if self.int8 else "")
+
+    @cached_property
+    def model(self):
+        ort = self.ort
+        so = ort.SessionOptions()
+        so.log_severity_level = 3
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        so.intra_op_num_threads = int(os.getenv("NYAYA_EMBED_INTRA", "2"))
+        so.inter_op_num_threads = 1
+        so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        return ort.InferenceSession(
+            self.model_path(self.int8),
+            providers=_resolve_providers(
+                ort.get_available_providers(), os.getenv("NYAYA_EMBED_DEVICE", "cpu"),
+            ),
+            sess_options=so,
+        )
@@ -10,8 +10,14 @@ Three document types:
   3. Mutual Consent Divorce Petition Draft (Section 13B, Hindu Marriage Act 1955)
 """
 
-from pathlib import Path
-from fpdf import FPDF
+import asyncio
+import os
+import pickle
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TypedDict
+from fpdf import FPDF, XPos, YPos
 
                              
 C_HEADER    = (30,  58, 138)                             
@@ -20,16 +26,214 @@ C_GRAY      = (100, 116, 139)
 C_BLACK     = (15,  23,  42)               
 C_MISSING   = (180, 60,  0)                                 
 C_FILLED    = (0,   100, 0)                                  
+_COLORS     = (C_MISSING, C_FILLED)
 
 BLANK       = "_________________________________"
 BLANK_SHORT = "__________________"
 
+class DVData(TypedDict, total=False):
+    """build_dv_pdf input; a bare-string nature_of_violence is taken as one item."""
+    complainant_name: str | None
+    complainant_age: str | None
+    complainant_address: str | None
+    complainant_phone: str | None
+    respondent_name: str | None
+    respondent_relation: str | None
+    respondent_address: str | None
+    nature_of_violence: list[str] | str
+    incident_date: str | None
+    incident_description: str | None
+    witnesses: str | None
+    children: list
+    children_text: str | None
+    relief_protection: bool
+    relief_residence: bool
+    relief_monetary_amount: str | None
+    relief_custody: bool
+
+
+# Category stems matched at the start of a word, so free text such as
+# "Physically abused" or "sexually harassed" still ticks its box.
+_VIOLENCE_RE = re.compile(r"\b(physical|sexual|verbal|emotional|economic|dowry)")
+_VIOLENCE_ALIASES = {"verbal": "emotional"}
+
+_HEADER_TITLE    = "PROJECT NYAYA -- AI Legal Assistance"
+_HEADER_SUBTITLE = "Free Legal Document Generation for Marginalized Communities in India"
+
+_DISCLAIMER_HEADING = "IMPORTANT NOTICE"
+_DISCLAIMER_TEXT = (
+    "This document is an AI-assisted DRAFT generated by Project Nyaya for informational purposes only. "
+    "It is NOT a substitute for professional legal advice. Before filing, please review it with a "
+    "qualified legal aid advocate or lawyer. "
+    "Fields shown in orange/blank lines are incomplete and MUST be filled before submission. "
+    "Green fields were extracted from your voice statement."
+)
+
+_RTI_INFO_HEADING = "HOW TO FILE THIS APPLICATION"
+_RTI_INFO_TEXT = (
+    "1. Hand deliver (get acknowledgement copy) or send by Registered Post to the PIO.\n"
+    "2. File online at rtionline.gov.in for central government departments.\n"
+    "3. PIO must respond within 30 days (Sec. 7) or 48 hours if life/liberty is concerned.\n"
+    "4. No response or refusal? File First Appeal FREE within 30 days.\n"
+    "5. Still no response? File Second Appeal to Central Information Commission -- cic.gov.in"
+)
+
+_DV_INFO_HEADING = "EMERGENCY CONTACTS -- ACT IMMEDIATELY IF IN DANGER"
+_DV_INFO_TEXT = (
+    "Women Helpline: 181 (Free, 24x7)  |  Police: 100  |  One Stop Centre: 181\n"
+    "Protection Officer: At district court or nearest police station -- completely FREE.\n"
+    "Magistrate MUST issue Protection Order within 3 days of receiving complaint (Sec. 12, PWDVA).\n"
+    "You can ALSO file Section 498A IPC at the police station for criminal action."
+)
+
+_DIVORCE_INFO_HEADING = "PROCEDURE -- WHAT TO DO NEXT"
+_DIVORCE_INFO_TEXT = (
+    "1. Get this draft reviewed and finalised by a lawyer before filing.\n"
+    "2. File in the Family Court of the district where you last lived together.\n"
+    "3. First Motion: Both appear together; judge records statements on oath.\n"
+    "4. Wait 6 months (cooling-off under Sec. 13B(2)) -- court may waive if marriage is irretrievably broken.\n"
+    "   (Amardeep Singh v. Harveen Kaur, Supreme Court 2017)\n"
+    "5. Second Motion: Both confirm mutual consent. Decree of divorce is granted."
+)
+
+_RTI_FEE_NOTE = (
+    "Fee: Rs. 10 (General) | BPL cardholders -- EXEMPT (attach BPL card copy) | "
+    "Payment: Court fee stamp / IPO / DD / Online at rtionline.gov.in"
+)
+_RTI_DECLARATION = (
+    "I hereby declare that the information requested does not relate to or affect the sovereignty "
+    "and integrity of India, the security, strategic, scientific or economic interests of the State, "
+    "relation with foreign State or lead to incitement of an offence. I am a citizen of India."
+)
+_DV_DECLARATION = (
+    "I, the undersigned, declare that the information given above is true and correct to the best "
+    "of my knowledge. I request the Hon'ble Magistrate / Protection Officer to take immediate action "
+    "on my complaint and grant the reliefs sought above under the PWDVA 2005."
+)
+_DIVORCE_PRAYER = (
+    "The petitioners, having mutually agreed and having lived separately for more than one year, "
+    "most respectfully pray that this Hon'ble Court may be pleased to:\n"
+    "  (a) Pass a decree of dissolution of marriage under Section 13B, Hindu Marriage Act 1955.\n"
+    "  (b) Record the settlement terms as agreed regarding alimony, child custody, and property.\n"
+    "  (c) Grant any other relief this Hon'ble Court deems fit."
+)
+_DIVORCE_VERIFICATION = (
+    "We, the petitioners, verify that the contents of this petition are true and correct "
+    "to the best of our knowledge and belief. Nothing has been concealed or falsely stated herein."
+)
+
+_LATIN1_TEXT = frozenset({
+    BLANK, BLANK_SHORT, _HEADER_TITLE, _HEADER_SUBTITLE,
+    _DISCLAIMER_HEADING, _DISCLAIMER_TEXT,
+    _RTI_INFO_HEADING, _RTI_INFO_TEXT,
+    _DV_INFO_HEADING, _DV_INFO_TEXT,
+    _DIVORCE_INFO_HEADING, _DIVORCE_INFO_TEXT,
+})
+for _text in _LATIN1_TEXT:
+    _text.encode("latin-1")
+
+
+class FormPDF(FPDF):
+    """
+    FPDF that skips the core-font encoding round-trip for the pre-validated
+    constants and drops set_font / set_text_color / set_fill_color calls that
+    would not change the current state.
+    """
+
+    _font_key = None
+    _text_key = None
+    _fill_key = None
+
+    def add_page(self, *args, **kwargs):
+        # fpdf re-applies font and colours itself on a new page; forget ours.
+        self._font_key = self._text_key = self._fill_key = None
+        super().add_page(*args, **kwargs)
+
+    def set_font(self, family=None, style="", size=0):
+        key = (family, style, size)
+        if key != self._font_key:
+            super().set_font(family, style, size)
+            self._font_key = key
+
+    def set_text_color(self, r, g=-1, b=-1):
+        key = (r, g, b)
+        if key != self._text_key:
+            super().set_text_color(r, g, b)
+            self._text_key = key
+
+    def set_fill_color(self, r, g=-1, b=-1):
+        key = (r, g, b)
+        if key != self._fill_key:
+            super().set_fill_color(r, g, b)
+            self._fill_key = key
+
+    def normalize_text(self, text):
+        if text in _LATIN1_TEXT:
+            return text
+        return super().normalize_text(text)
+
+
+def _wrap(text: str, size: float, width: float = 190, style: str = "") -> tuple[str, ...]:
+    """Break text into the lines multi_cell would produce for a `width` mm Helvetica cell."""
+    # A private measuring FPDF per call: its font is mutable state, and
+    # _info_box may call this from several _PDF_POOL threads at once.
+    metrics = FPDF()
+    metrics.set_font("Helvetica", style, size)
+    avail = width - 2 * metrics.c_margin
+    lines: list[str] = []
+    for para in text.split("\n"):
+        line = None
+        for word in para.split(" "):
+            if line is None:
+                line = word
+                continue
+            candidate = line + " " + word
+            if line.strip() and metrics.get_string_width(candidate) > avail:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return tuple(lines)
+
+
+_DISCLAIMER_LINES = _wrap(_DISCLAIMER_TEXT, 7.5)
+_INFO_LINES = {
+    text: _wrap(text, 8)
+    for text in (_RTI_INFO_TEXT, _DV_INFO_TEXT, _DIVORCE_INFO_TEXT)
+}
+_RTI_FEE_LINES = _wrap(_RTI_FEE_NOTE, 8, 186, "I")
+_RTI_DECLARATION_LINES = _wrap(_RTI_DECLARATION, 9, 186)
+_DV_DECLARATION_LINES = _wrap(_DV_DECLARATION, 9, 186)
+_DIVORCE_PRAYER_LINES = _wrap(_DIVORCE_PRAYER, 9, 186)
+_DIVORCE_VERIFICATION_LINES = _wrap(_DIVORCE_VERIFICATION, 9, 186)
+_LATIN1_TEXT = _LATIN1_TEXT.union(
+    _DISCLAIMER_LINES, *_INFO_LINES.values(),
+    _RTI_FEE_LINES, _RTI_DECLARATION_LINES, _DV_DECLARATION_LINES,
+    _DIVORCE_PRAYER_LINES, _DIVORCE_VERIFICATION_LINES,
+)
+
+
+def _prose(pdf: FormPDF, lines: tuple[str, ...], h: float) -> None:
+    """Pre-wrapped fixed paragraph at x=12, one 186 mm cell per line."""
+    pdf.set_x(12)
+    for line in lines:
+        pdf.cell(186, h, line, new_x=XPos.LEFT, new_y=YPos.NEXT)
+
+
+def _boxed_lines(pdf: FormPDF, lines: tuple[str, ...], h: float) -> None:
+    """Pre-wrapped lines as one filled box (left/right borders, bottom on the last line)."""
+    last = len(lines) - 1
+    for i, line in enumerate(lines):
+        pdf.cell(190, h, line, border="LRB" if i == last else "LR", fill=True,
+                 new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
 
                                                                              
                        
                                                                              
 
-def _start(pdf: FPDF, title: str, subtitle: str, note: str) -> None:
+def _start(pdf: FormPDF, title: str, subtitle: str, note: str) -> None:
     """Render the Nyaya header + document title block."""
                  
     pdf.set_fill_color(*C_HEADER)
@@ -37,10 +241,10 @@ def _start(pdf: FPDF, title: str, subtitle: str, note: str) -> None:
     pdf.set_text_color(255, 255, 255)
     pdf.set_font("Helvetica", "B", 14)
     pdf.set_xy(10, 5)
-    pdf.cell(190, 8, "PROJECT NYAYA -- AI Legal Assistance", align="C")
+    pdf.cell(190, 8, _HEADER_TITLE, align="C")
     pdf.set_font("Helvetica", "", 9)
     pdf.set_xy(10, 13)
-    pdf.cell(190, 6, "Free Legal Document Generation for Marginalized Communities in India", align="C")
+    pdf.cell(190, 6, _HEADER_SUBTITLE, align="C")
     pdf.set_font("Helvetica", "I", 7)
     pdf.set_xy(10, 20)
     pdf.cell(190, 5, note, align="C")
@@ -58,145 +262,191 @@ def _start(pdf: FPDF, title: str, subtitle: str, note: str) -> None:
     pdf.set_y(52)
 
 
-def _sec(pdf: FPDF, label: str) -> None:
+def _sec(pdf: FormPDF, label: str) -> None:
     """Blue section heading strip."""
     pdf.set_fill_color(*C_ACCENT)
     pdf.set_text_color(255, 255, 255)
     pdf.set_font("Helvetica", "B", 9)
     pdf.set_x(10)
-    pdf.cell(190, 6, "  " + label.upper(), fill=True, ln=True)
+    pdf.cell(190, 6, "  " + label.upper(), fill=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(2)
 
 
-def _row(pdf: FPDF, label: str, value) -> None:
+def _row(pdf: FormPDF, label: str, value) -> None:
     """Single labelled value row."""
     pdf.set_x(12)
     pdf.set_font("Helvetica", "B", 9)
     pdf.set_text_color(*C_BLACK)
     pdf.cell(55, 7, label + ":", border="B")
     pdf.set_font("Helvetica", "", 9)
-    if value:
-        pdf.set_text_color(*C_FILLED)
-        pdf.cell(133, 7, str(value).strip(), border="B", ln=True)
-    else:
-        pdf.set_text_color(*C_MISSING)
-        pdf.cell(133, 7, BLANK, border="B", ln=True)
-    pdf.set_text_color(*C_BLACK)
-    pdf.ln(1)
+    pdf.set_text_color(*_COLORS[bool(value)])
+    pdf.cell(133, 7, str(value) if value else BLANK, border="B")
+    pdf.ln(8)
 
 
-def _row2(pdf: FPDF, lbl1: str, v1, lbl2: str, v2) -> None:
+def _row2(pdf: FormPDF, lbl1: str, v1, lbl2: str, v2) -> None:
     """Two fields on one line."""
+    cell, set_font, set_text_color = pdf.cell, pdf.set_font, pdf.set_text_color
     pdf.set_x(12)
-    pdf.set_font("Helvetica", "B", 9)
-    pdf.set_text_color(*C_BLACK)
-    pdf.cell(30, 7, lbl1 + ":")
-    pdf.set_font("Helvetica", "", 9)
-    pdf.set_text_color(C_FILLED if v1 else C_MISSING)
-    pdf.cell(55, 7, str(v1).strip() if v1 else BLANK_SHORT, border="B")
-    pdf.set_text_color(*C_BLACK)
-    pdf.set_font("Helvetica", "B", 9)
-    pdf.cell(30, 7, "  " + lbl2 + ":")
-    pdf.set_font("Helvetica", "", 9)
-    pdf.set_text_color(C_FILLED if v2 else C_MISSING)
-    pdf.cell(60, 7, str(v2).strip() if v2 else BLANK_SHORT, border="B", ln=True)
-    pdf.set_text_color(*C_BLACK)
-    pdf.ln(1)
-
-
-def _block(pdf: FPDF, label: str, value, lines: int = 3) -> None:
+    set_font("Helvetica", "B", 9)
+    set_text_color(*C_BLACK)
+    cell(30, 7, lbl1 + ":")
+    set_font("Helvetica", "", 9)
+    set_text_color(*_COLORS[bool(v1)])
+    cell(55, 7, str(v1) if v1 else BLANK_SHORT, border="B")
+    set_text_color(*C_BLACK)
+    set_font("Helvetica", "B", 9)
+    cell(30, 7, "  " + lbl2 + ":")
+    set_font("Helvetica", "", 9)
+    set_text_color(*_COLORS[bool(v2)])
+    cell(60, 7, str(v2) if v2 else BLANK_SHORT, border="B")
+    pdf.ln(8)
+
+
+def _block(pdf: FormPDF, label: str, value, lines: int = 3) -> None:
     """Multi-line text block field."""
     pdf.set_x(12)
     pdf.set_font("Helvetica", "B", 9)
     pdf.set_text_color(*C_BLACK)
-    pdf.cell(190, 6, label + ":", ln=True)
-    pdf.set_x(12)
+    pdf.cell(190, 6, label + ":", new_x=XPos.LEFT, new_y=YPos.NEXT)
     pdf.set_font("Helvetica", "", 9)
+    pdf.set_text_color(*_COLORS[bool(value)])
     if value:
-        pdf.set_text_color(*C_FILLED)
-        pdf.multi_cell(186, 5, str(value).strip(), border=1)
+        pdf.multi_cell(186, 5, str(value), border=1)
+        pdf.ln(2)
     else:
-        pdf.set_text_color(*C_MISSING)
         pdf.set_fill_color(255, 248, 230)
-        pdf.cell(186, lines * 6, "", border=1, fill=True, ln=True)
-    pdf.set_text_color(*C_BLACK)
-    pdf.ln(2)
+        pdf.cell(186, lines * 6, "", border=1, fill=True)
+        pdf.ln(lines * 6 + 2)
 
 
-def _checkbox(pdf: FPDF, label: str, checked: bool) -> None:
+def _checkbox(pdf: FormPDF, label: str, checked: bool) -> None:
     """Simple ASCII checkbox row."""
     pdf.set_x(14)
     pdf.set_font("Helvetica", "", 9)
     pdf.set_text_color(*C_BLACK)
     mark = "[X]" if checked else "[ ]"
     pdf.cell(12, 6, mark)
-    pdf.cell(175, 6, label, ln=True)
+    pdf.cell(175, 6, label, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+
+def _prep(data: dict) -> dict:
+    """Strip scalar field values once per document; blank values become None."""
+    prepped = {}
+    for key, value in data.items():
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            value = (str(value).strip() or None) if value else None
+        prepped[key] = value
+    return prepped
+
 
+def _normalize_children(raw) -> list[tuple[str, str]]:
+    """Flatten the extracted children list (dicts or bare names) into (name, age) pairs."""
+    children = []
+    for c in raw or ():
+        if isinstance(c, dict):
+            children.append((str(c.get("name") or "").strip(), str(c.get("age") or "").strip()))
+        else:
+            children.append((str(c).strip(), ""))
+    return children
 
-def _disclaimer(pdf: FPDF) -> None:
+
+def _violence_items(raw) -> list[str]:
+    """The extracted nature_of_violence as a list: a bare string is one item, non-strings are dropped."""
+    if isinstance(raw, str):
+        return [raw]
+    if isinstance(raw, list):
+        return [v for v in raw if isinstance(v, str)]
+    return []
+
+
+def _disclaimer(pdf: FormPDF) -> None:
     """Standard legal disclaimer box."""
     pdf.set_fill_color(254, 243, 199)
     pdf.set_draw_color(180, 120, 0)
     pdf.set_x(10)
     pdf.set_font("Helvetica", "B", 8)
     pdf.set_text_color(120, 70, 0)
-    pdf.cell(190, 5, "IMPORTANT NOTICE", border="TB", fill=True, ln=True, align="C")
+    pdf.cell(190, 5, _DISCLAIMER_HEADING, border="TB", fill=True, align="C",
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_font("Helvetica", "", 7.5)
-    pdf.set_x(10)
-    pdf.multi_cell(
-        190, 4.5,
-        "This document is an AI-assisted DRAFT generated by Project Nyaya for informational purposes only. "
-        "It is NOT a substitute for professional legal advice. Before filing, please review it with a "
-        "qualified legal aid advocate or lawyer. "
-        "Fields shown in orange/blank lines are incomplete and MUST be filled before submission. "
-        "Green fields were extracted from your voice statement.",
-        border="LRB", fill=True,
-    )
-
-
-def _sig(pdf: FPDF) -> None:
+    _boxed_lines(pdf, _DISCLAIMER_LINES, 4.5)
+
+
+def _sig(pdf: FormPDF) -> None:
     """Signature block."""
     pdf.ln(5)
-    pdf.set_x(10)
     pdf.set_font("Helvetica", "", 9)
     pdf.cell(95, 6, "Place:  " + BLANK_SHORT)
-    pdf.cell(95, 6, "Signature: " + BLANK_SHORT, ln=True)
-    pdf.set_x(10)
+    pdf.cell(95, 6, "Signature: " + BLANK_SHORT, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.cell(95, 6, "Date:   " + BLANK_SHORT)
-    pdf.cell(95, 6, "Name (in full): " + BLANK_SHORT, ln=True)
+    pdf.cell(95, 6, "Name (in full): " + BLANK_SHORT, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
 
-def _info_box(pdf: FPDF, heading: str, lines_text: str) -> None:
+def _info_box(pdf: FormPDF, heading: str, lines_text: str) -> None:
     """Blue info box at the end of document."""
     pdf.set_fill_color(219, 234, 254)
     pdf.set_x(10)
     pdf.set_font("Helvetica", "B", 8)
     pdf.set_text_color(30, 58, 138)
-    pdf.cell(190, 5, heading, fill=True, ln=True, align="C")
+    pdf.cell(190, 5, heading, fill=True, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_font("Helvetica", "", 8)
-    pdf.set_x(10)
-    pdf.multi_cell(190, 4.5, lines_text, fill=True, border="LRB")
+    _boxed_lines(pdf, _INFO_LINES.get(lines_text) or _wrap(lines_text, 8), 4.5)
     pdf.set_text_color(*C_BLACK)
     pdf.ln(5)
 
 
-                                                                             
-                            
-                                                                             
-
-def build_rti_pdf(data: dict, pdf_path: Path) -> None:
-    """RTI Application -- Section 6, RTI Act 2005."""
-    pdf = FPDF()
+def _template(title: str, subtitle: str, note: str) -> bytes:
+    """
+    Render the fixed page-one scaffolding (page setup + header block) once and
+    snapshot it. Builders restore a private copy and only draw the variable rows.
+    """
+    pdf = FormPDF()
+    pdf.compress = True
     pdf.set_auto_page_break(auto=True, margin=18)
     pdf.add_page()
     pdf.set_margins(10, 10, 10)
+    _start(pdf, title, subtitle, note)
+    return pickle.dumps(pdf, protocol=pickle.HIGHEST_PROTOCOL)
 
-    _start(
-        pdf,
+
+_TEMPLATES: dict[str, bytes] = {
+    "rti": _template(
         "APPLICATION FOR INFORMATION UNDER THE RIGHT TO INFORMATION ACT, 2005",
         "Section 6(1), Right to Information Act 2005  |  Address to the Public Information Officer (PIO)",
         "Ref: RTI Act 2005 -- BPL holders exempt from Rs. 10 fee.",
-    )
+    ),
+    "dv": _template(
+        "COMPLAINT UNDER THE PROTECTION OF WOMEN FROM DOMESTIC VIOLENCE ACT, 2005",
+        "To: Protection Officer / Magistrate / Police Station  |  Section 12, PWDVA 2005",
+        "Filing is FREE. Emergency Protection Order: Section 18. Response within 3 days.",
+    ),
+    "divorce": _template(
+        "MUTUAL CONSENT DIVORCE PETITION -- DRAFT",
+        "Section 13B, Hindu Marriage Act 1955  |  File in Family Court of last shared residence",
+        "Both petitioners must have lived separately for min. 1 year. Court fee: approx. Rs. 200-500.",
+    ),
+}
+
+
+def _new_pdf(kind: str) -> FormPDF:
+    """
+    Private copy of the pre-rendered scaffold for one document type, stamped
+    with its own creation date rather than the template's (process start).
+    """
+    pdf = pickle.loads(_TEMPLATES[kind])
+    pdf.set_creation_date(datetime.now(timezone.utc))
+    return pdf
+
+
+                                                                             
+                            
+                                                                             
+
+def build_rti_pdf(data: dict) -> bytes:
+    """RTI Application -- Section 6, RTI Act 2005."""
+    pdf = _new_pdf("rti")
+    data = _prep(data)
 
     _sec(pdf, "PART A -- Applicant Details")
     _row(pdf, "Full Name", data.get("name"))
@@ -219,58 +469,32 @@ def build_rti_pdf(data: dict, pdf_path: Path) -> None:
 
     _sec(pdf, "PART D -- Fee Details")
     _row(pdf, "Fee payment mode", data.get("fee_payment_mode"))
-    pdf.set_x(12)
     pdf.set_font("Helvetica", "I", 8)
     pdf.set_text_color(*C_GRAY)
-    pdf.multi_cell(
-        186, 5,
-        "Fee: Rs. 10 (General) | BPL cardholders -- EXEMPT (attach BPL card copy) | "
-        "Payment: Court fee stamp / IPO / DD / Online at rtionline.gov.in"
-    )
+    _prose(pdf, _RTI_FEE_LINES, 5)
     pdf.set_text_color(*C_BLACK)
     pdf.ln(3)
 
     _sec(pdf, "PART E -- Declaration")
-    pdf.set_x(12)
     pdf.set_font("Helvetica", "", 9)
-    pdf.multi_cell(
-        186, 5.5,
-        "I hereby declare that the information requested does not relate to or affect the sovereignty "
-        "and integrity of India, the security, strategic, scientific or economic interests of the State, "
-        "relation with foreign State or lead to incitement of an offence. I am a citizen of India.",
-    )
+    _prose(pdf, _RTI_DECLARATION_LINES, 5.5)
     pdf.ln(2)
     _sig(pdf)
     pdf.ln(5)
 
-    _info_box(pdf, "HOW TO FILE THIS APPLICATION",
-        "1. Hand deliver (get acknowledgement copy) or send by Registered Post to the PIO.\n"
-        "2. File online at rtionline.gov.in for central government departments.\n"
-        "3. PIO must respond within 30 days (Sec. 7) or 48 hours if life/liberty is concerned.\n"
-        "4. No response or refusal? File First Appeal FREE within 30 days.\n"
-        "5. Still no response? File Second Appeal to Central Information Commission -- cic.gov.in"
-    )
+    _info_box(pdf, _RTI_INFO_HEADING, _RTI_INFO_TEXT)
     _disclaimer(pdf)
-    pdf.output(str(pdf_path))
+    return bytes(pdf.output())
 
 
                                                                              
                                         
                                                                              
 
-def build_dv_pdf(data: dict, pdf_path: Path) -> None:
+def build_dv_pdf(data: DVData) -> bytes:
     """DV Complaint -- PWDVA 2005, to Protection Officer / Police."""
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=18)
-    pdf.add_page()
-    pdf.set_margins(10, 10, 10)
-
-    _start(
-        pdf,
-        "COMPLAINT UNDER THE PROTECTION OF WOMEN FROM DOMESTIC VIOLENCE ACT, 2005",
-        "To: Protection Officer / Magistrate / Police Station  |  Section 12, PWDVA 2005",
-        "Filing is FREE. Emergency Protection Order: Section 18. Response within 3 days.",
-    )
+    pdf = _new_pdf("dv")
+    data = _prep(data)
 
     _sec(pdf, "PART A -- Complainant (Aggrieved Person)")
     _row(pdf, "Full Name", data.get("complainant_name"))
@@ -284,15 +508,13 @@ def build_dv_pdf(data: dict, pdf_path: Path) -> None:
     pdf.ln(2)
 
     _sec(pdf, "PART C -- Nature of Violence (Section 3, PWDVA 2005)")
-    violence = data.get("nature_of_violence") or []
-    if isinstance(violence, str):
-        violence = [violence]
-    joined = " ".join(violence)
-    _checkbox(pdf, "Physical Abuse (Sec. 3(a))",        "Physical"  in joined)
-    _checkbox(pdf, "Sexual Abuse (Sec. 3(b))",          "Sexual"    in joined)
-    _checkbox(pdf, "Verbal / Emotional Abuse (Sec. 3(c))", any(x in joined for x in ["Verbal","Emotional"]))
-    _checkbox(pdf, "Economic Abuse (Sec. 3(d))",        "Economic"  in joined)
-    _checkbox(pdf, "Dowry Harassment (Sec. 498A IPC)",  "Dowry"     in joined)
+    violence = _violence_items(data.get("nature_of_violence"))
+    cats = {_VIOLENCE_ALIASES.get(w, w) for item in violence for w in _VIOLENCE_RE.findall(item.lower())}
+    _checkbox(pdf, "Physical Abuse (Sec. 3(a))",        "physical"  in cats)
+    _checkbox(pdf, "Sexual Abuse (Sec. 3(b))",          "sexual"    in cats)
+    _checkbox(pdf, "Verbal / Emotional Abuse (Sec. 3(c))", "emotional" in cats)
+    _checkbox(pdf, "Economic Abuse (Sec. 3(d))",        "economic"  in cats)
+    _checkbox(pdf, "Dowry Harassment (Sec. 498A IPC)",  "dowry"     in cats)
     pdf.ln(2)
 
     _sec(pdf, "PART D -- Incident Details")
@@ -302,11 +524,9 @@ def build_dv_pdf(data: dict, pdf_path: Path) -> None:
     pdf.ln(2)
 
     _sec(pdf, "PART E -- Children (if any)")
-    children = data.get("children") or []
+    children = _normalize_children(data.get("children"))
     if children:
-        for c in children:
-            n = c.get("name", "") if isinstance(c, dict) else str(c)
-            a = c.get("age", "")  if isinstance(c, dict) else ""
+        for n, a in children:
             _row2(pdf, "Child Name", n, "Age", a)
     else:
         _row(pdf, "Children", data.get("children_text"))
@@ -325,50 +545,30 @@ def build_dv_pdf(data: dict, pdf_path: Path) -> None:
     pdf.ln(3)
 
     _sec(pdf, "PART G -- Declaration")
-    pdf.set_x(12)
     pdf.set_font("Helvetica", "", 9)
-    pdf.multi_cell(
-        186, 5.5,
-        "I, the undersigned, declare that the information given above is true and correct to the best "
-        "of my knowledge. I request the Hon'ble Magistrate / Protection Officer to take immediate action "
-        "on my complaint and grant the reliefs sought above under the PWDVA 2005.",
-    )
+    _prose(pdf, _DV_DECLARATION_LINES, 5.5)
     pdf.ln(2)
     _sig(pdf)
     pdf.ln(5)
 
-    _info_box(pdf, "EMERGENCY CONTACTS -- ACT IMMEDIATELY IF IN DANGER",
-        "Women Helpline: 181 (Free, 24x7)  |  Police: 100  |  One Stop Centre: 181\n"
-        "Protection Officer: At district court or nearest police station -- completely FREE.\n"
-        "Magistrate MUST issue Protection Order within 3 days of receiving complaint (Sec. 12, PWDVA).\n"
-        "You can ALSO file Section 498A IPC at the police station for criminal action."
-    )
+    _info_box(pdf, _DV_INFO_HEADING, _DV_INFO_TEXT)
     _disclaimer(pdf)
-    pdf.output(str(pdf_path))
+    return bytes(pdf.output())
 
 
                                                                              
                                                                     
                                                                              
 
-def build_divorce_pdf(data: dict, pdf_path: Path) -> None:
+def build_divorce_pdf(data: dict) -> bytes:
     """Section 13B Mutual Consent Divorce Petition Draft."""
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=18)
-    pdf.add_page()
-    pdf.set_margins(10, 10, 10)
-
-    _start(
-        pdf,
-        "MUTUAL CONSENT DIVORCE PETITION -- DRAFT",
-        "Section 13B, Hindu Marriage Act 1955  |  File in Family Court of last shared residence",
-        "Both petitioners must have lived separately for min. 1 year. Court fee: approx. Rs. 200-500.",
-    )
+    pdf = _new_pdf("divorce")
+    data = _prep(data)
 
     _sec(pdf, "IN THE FAMILY COURT AT ___________________")
     pdf.set_x(12)
     pdf.set_font("Helvetica", "", 9)
-    pdf.cell(190, 6, "Divorce Petition No. _____ / 20____  (to be filled by court)", ln=True)
+    pdf.cell(190, 6, "Divorce Petition No. _____ / 20____  (to be filled by court)", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(3)
 
     _sec(pdf, "PETITIONER 1 (Husband / First Party)")
@@ -400,11 +600,9 @@ def build_divorce_pdf(data: dict, pdf_path: Path) -> None:
     pdf.ln(4)
 
     _sec(pdf, "CHILDREN (if any)")
-    children = data.get("children") or []
+    children = _normalize_children(data.get("children"))
     if children:
-        for c in children:
-            n = c.get("name", "") if isinstance(c, dict) else str(c)
-            a = c.get("age", "")  if isinstance(c, dict) else ""
+        for n, a in children:
             _row2(pdf, "Child Name", n, "Age", a)
     else:
         _row(pdf, "Children details", data.get("children_text", "No children / Not provided"))
@@ -419,43 +617,61 @@ def build_divorce_pdf(data: dict, pdf_path: Path) -> None:
     pdf.ln(2)
 
     _sec(pdf, "PRAYER TO THE HON'BLE COURT")
-    pdf.set_x(12)
     pdf.set_font("Helvetica", "", 9)
-    pdf.multi_cell(
-        186, 5.5,
-        "The petitioners, having mutually agreed and having lived separately for more than one year, "
-        "most respectfully pray that this Hon'ble Court may be pleased to:\n"
-        "  (a) Pass a decree of dissolution of marriage under Section 13B, Hindu Marriage Act 1955.\n"
-        "  (b) Record the settlement terms as agreed regarding alimony, child custody, and property.\n"
-        "  (c) Grant any other relief this Hon'ble Court deems fit.",
-    )
+    _prose(pdf, _DIVORCE_PRAYER_LINES, 5.5)
     pdf.ln(3)
 
     _sec(pdf, "DECLARATION & VERIFICATION")
-    pdf.set_x(12)
     pdf.set_font("Helvetica", "", 9)
-    pdf.multi_cell(
-        186, 5.5,
-        "We, the petitioners, verify that the contents of this petition are true and correct "
-        "to the best of our knowledge and belief. Nothing has been concealed or falsely stated herein.",
-    )
+    _prose(pdf, _DIVORCE_VERIFICATION_LINES, 5.5)
     pdf.ln(4)
     pdf.set_x(12)
     pdf.set_font("Helvetica", "", 9)
     pdf.cell(90, 6, "Signature of Petitioner 1: " + BLANK_SHORT)
-    pdf.cell(90, 6, "Signature of Petitioner 2: " + BLANK_SHORT, ln=True)
+    pdf.cell(90, 6, "Signature of Petitioner 2: " + BLANK_SHORT, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_x(12)
     pdf.cell(90, 6, "Date: " + BLANK_SHORT)
-    pdf.cell(90, 6, "Date: " + BLANK_SHORT, ln=True)
+    pdf.cell(90, 6, "Date: " + BLANK_SHORT, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(3)
 
-    _info_box(pdf, "PROCEDURE -- WHAT TO DO NEXT",
-        "1. Get this draft reviewed and finalised by a lawyer before filing.\n"
-        "2. File in the Family Court of the district where you last lived together.\n"
-        "3. First Motion: Both appear together; judge records statements on oath.\n"
-        "4. Wait 6 months (cooling-off under Sec. 13B(2)) -- court may waive if marriage is irretrievably broken.\n"
-        "   (Amardeep Singh v. Harveen Kaur, Supreme Court 2017)\n"
-        "5. Second Motion: Both confirm mutual consent. Decree of divorce is granted."
-    )
+    _info_box(pdf, _DIVORCE_INFO_HEADING, _DIVORCE_INFO_TEXT)
     _disclaimer(pdf)
-    pdf.output(str(pdf_path))
+    return bytes(pdf.output())
+
+
+_PDF_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="nyaya-pdf")
+
+
+async def _in_pool(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_PDF_POOL, fn, *args)
+
+
+def _write(pdf_path: str | os.PathLike, pdf_bytes: bytes) -> None:
+    with open(os.fspath(pdf_path), "wb") as f:
+        f.write(pdf_bytes)
+
+
+async def build_rti_pdf_async(data: dict) -> bytes:
+    return await _in_pool(build_rti_pdf, data)
+
+
+async def build_dv_pdf_async(data: dict) -> bytes:
+    return await _in_pool(build_dv_pdf, data)
+
+
+async def build_divorce_pdf_async(data: dict) -> bytes:
+    return await _in_pool(build_divorce_pdf, data)
+
+
+async def save_pdf_async(pdf_bytes: bytes, pdf_path: str | os.PathLike) -> None:
+    """Write rendered PDF bytes to disk on the PDF pool, off the event loop."""
+    await _in_pool(_write, pdf_path, pdf_bytes)
+
+
+async def warm_up_async() -> None:
+    """
+    Render each form once, with empty data, on the PDF pool. This starts the
+    pool's threads and pays fpdf's first-output setup before the first real
+    request arrives instead of during it.
+    """
+    await asyncio.gather(*(_in_pool(build, {}) for build in (build_rti_pdf, build_dv_pdf, build_divorce_pdf)))
@@ -5,30 +5,44 @@ Voice-first legal triage for marginalized communities.
 
 Context retrieval pipeline (priority order):
   1. Live web fetch from official Indian government portals (httpx, async, 6s timeout)
-  2. ChromaDB semantic search (ONNXMiniLM-L6-v2) — fallback if web fetch returns < 300 chars
+  2. Local RAG: exact cosine (numpy) over the legal chunks' ONNXMiniLM-L6-v2 embeddings — fallback if web fetch returns < 300 chars
   3. Both sources are fused when web fetch succeeds, so the LLM gets the richest possible context
 """
 
 import asyncio
+import hashlib
 import os
+import sys
 import uuid
-import json
-import tempfile
+import pickle
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
-import chromadb
-from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
-from groq import Groq
+import httpx
+import numpy as np
+import orjson
+from groq import AsyncGroq, RateLimitError
 from dotenv import load_dotenv
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from fpdf import FPDF
+from fastapi.responses import FileResponse, JSONResponse, Response
+from pydantic import BaseModel, Field, field_validator
+from fpdf import XPos, YPos
 
-from web_fetcher import fetch_government_context, get_available_sources, GOVERNMENT_SOURCES
+from embeddings import NyayaEmbeddingFunction
+from knowledge_base import (
+    LEGAL_CONTEXTS, LEGAL_METAS, LEGAL_TEXTS, load_embeddings, save_embeddings,
+)
+from web_fetcher import (
+    fetch_government_context, flush_cache, make_client, warm_up,
+    CACHE_TTL, GOVERNMENT_SOURCES,
+)
 
                                                                              
            
@@ -41,13 +55,83 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not DEMO_MODE and not GROQ_API_KEY:
     raise RuntimeError("GROQ_API_KEY is not set. Add it to .env or set DEMO_MODE=true.")
 
-groq_client = Groq(api_key=GROQ_API_KEY) if GROQ_API_KEY else None
+# One pooled HTTP/2 connection set to api.groq.com, shared by every request;
+# concurrent completions multiplex over it instead of opening new sockets.
+# The SDK applies its own per-request timeout (60 s by default), so the
+# 30 s cap is set here rather than on the httpx client.
+groq_client = AsyncGroq(
+    api_key=GROQ_API_KEY,
+    timeout=httpx.Timeout(30.0, connect=5.0),
+    # Retries 429s and 5xx with jittered exponential backoff, honouring Retry-After.
+    # Two retries, not more: every attempt runs inside _GROQ_CALL_BUDGET, and
+    # further ones would only be cut off by it while holding a semaphore slot.
+    max_retries=2,
+    http_client=httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=20, keepalive_expiry=30),
+    ),
+) if GROQ_API_KEY else None
+
+# Upper bound on Groq calls in flight from this worker; a burst queues here
+# rather than tripping Groq's rate limit for everyone.
+_GROQ_SEMAPHORE = asyncio.Semaphore(32)
+# Wall-clock cap on one call including the SDK's retries (each attempt gets
+# its own 30 s timeout), so a hung call holds a semaphore slot for at most
+# this long.
+_GROQ_CALL_BUDGET = 45.0
 
 BASE_DIR = Path(__file__).parent
 STATIC_DIR = BASE_DIR / "static"
 STATIC_DIR.mkdir(exist_ok=True)
 
-app = FastAPI(title="Project Nyaya API", version="4.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load the RAG chunk vectors (or, in DEMO_MODE, render the demo PDFs) off
+    the event loop, warm the form PDF builders and open the shared portal
+    client before serving; every portal is pre-fetched in the background
+    without holding up start-up. On exit stop the pre-fetch, write the
+    portal cache, close the portal and Groq connection pools and stop the
+    embed batcher.
+    """
+    global _chunk_vecs, _web_client
+    _web_client = make_client()
+    # Requests arriving before it finishes just miss the portal cache.
+    portal_warm_up = None if DEMO_MODE else asyncio.create_task(warm_up(_web_client))
+    try:
+        if DEMO_MODE:
+            _DEMO_BODIES.update(await asyncio.to_thread(_render_demo_bodies))
+        else:
+            _chunk_vecs = await asyncio.to_thread(_load_chunk_vecs)
+        await warm_up_async()
+        yield
+    finally:
+        if portal_warm_up is not None:
+            portal_warm_up.cancel()
+            await asyncio.gather(portal_warm_up, return_exceptions=True)
+        await flush_cache()
+        await _web_client.aclose()
+        if _embed_task is not None:
+            _embed_task.cancel()
+            await asyncio.gather(_embed_task, return_exceptions=True)
+        if groq_client is not None:
+            await groq_client.close()
+
+
+class _OrjsonResponse(JSONResponse):
+    """JSONResponse encoded with orjson (FastAPI's own ORJSONResponse is deprecated)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+app = FastAPI(
+    title="Project Nyaya API",
+    version="4.0.0",
+    lifespan=lifespan,
+    default_response_class=_OrjsonResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -57,7 +141,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+# Every file under /static is written once under a unique (hash or uuid)
+# name and never changed, so clients and CDNs may cache it indefinitely.
+# Behind nginx, NYAYA_ACCEL_REDIRECT names an internal location aliased to
+# STATIC_DIR; nginx then sendfile()s the PDF instead of Python streaming it.
+_STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_ACCEL_REDIRECT = os.getenv("NYAYA_ACCEL_REDIRECT", "").rstrip("/")
+
+
+class _ImmutableStaticFiles(StaticFiles):
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        if _ACCEL_REDIRECT:
+            return Response(
+                status_code=status_code,
+                headers={
+                    "X-Accel-Redirect": f"{_ACCEL_REDIRECT}/{Path(full_path).name}",
+                    "Cache-Control": _STATIC_CACHE_CONTROL,
+                },
+            )
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = _STATIC_CACHE_CONTROL
+        return response
+
+
+app.mount("/static", _ImmutableStaticFiles(directory=str(STATIC_DIR)), name="static")
 
                                                                              
                                       
@@ -66,355 +173,103 @@ app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
                                                                              
                                                                              
 
-_chroma_client = chromadb.Client()
-_embed_fn = ONNXMiniLM_L6_V2()
-
-LEGAL_CHUNKS = [
-                                                                             
-    {
-        "id": "rti_scope_definition",
-        "topic": "RTI",
-        "section": "Scope and Definitions",
-        "text": (
-            "RTI Act 2005 — Scope and Who Can File: "
-            "Section 2(f) defines 'Information' as any material in any form — records, documents, memos, "
-            "emails, opinions, advices, press releases, circulars, orders, logbooks, contracts, reports, "
-            "samples, models, and electronic data. "
-            "Section 2(h) defines 'Public Authority' as any body established by the Constitution, Parliament, "
-            "State Legislature, or Government notification — includes all central/state departments, PSUs, "
-            "government-aided institutions, banks, courts (except Supreme Court registry). "
-            "Section 2(j): Every citizen of India has the right to inspect records, obtain certified copies, "
-            "and take certified samples of material held by public authorities. "
-            "RTI does NOT apply to intelligence agencies listed in Second Schedule (e.g., RAW, IB) "
-            "except on matters of corruption or human rights violations (Section 24)."
-        ),
-    },
-    {
-        "id": "rti_filing_procedure",
-        "topic": "RTI",
-        "section": "Filing Procedure",
-        "text": (
-            "RTI Act 2005 — How to File an RTI Application (Section 6): "
-            "Write a plain application in English, Hindi, or any official language of the area. "
-            "Address it to the Public Information Officer (PIO) of the relevant department. "
-            "NO reasons or justification required — Section 6(1) explicitly states this. "
-            "Pay fee of Rs. 10 by Indian Postal Order (IPO), Demand Draft, court fee stamp, or cash. "
-            "BPL (Below Poverty Line) card holders are FULLY EXEMPT from all fees — attach BPL card copy. "
-            "File ONLINE at rtionline.gov.in for all central government departments. "
-            "File by speed post / registered post or in person at the department office. "
-            "Section 6(3): If the PIO of the wrong department receives your application, they MUST transfer "
-            "it to the correct public authority within 5 days and inform you."
-        ),
-    },
-    {
-        "id": "rti_timelines_deadlines",
-        "topic": "RTI",
-        "section": "Timelines and Deadlines",
-        "text": (
-            "RTI Act 2005 — Timelines and Deadlines: "
-            "Section 7(1): The PIO must provide information within 30 days of receiving the application. "
-            "Section 7(1) Proviso: If information concerns the life or liberty of a person, the PIO must respond "
-            "within 48 HOURS. Courts have interpreted 'life and liberty' broadly to include ration cards, MGNREGA wages, "
-            "pension disbursement, and police safety. "
-            "Section 7(2): If information pertains to a third party, the PIO gets 40 days to respond. "
-            "Section 7(5): If the PIO misses the 30-day deadline, information must be provided FREE OF COST. "
-            "Section 7(6): Partial disclosure — PIO can supply part of the information and deny the rest with reasons. "
-            "Deemed Refusal: If PIO does not respond within 30 days, it is treated as a refusal and the applicant "
-            "can immediately file a First Appeal."
-        ),
-    },
-    {
-        "id": "rti_fees_charges",
-        "topic": "RTI",
-        "section": "Fees and Charges",
-        "text": (
-            "RTI Act 2005 — Detailed Fee Structure: "
-            "Application fee: Rs. 10 (IPO, DD, court fee stamp, or cash). "
-            "BPL applicants: ZERO fee for application AND information — attach BPL card copy. "
-            "Information fee: Rs. 2 per page (A4 or A3 size), Rs. 5 per page (larger), "
-            "Rs. 50 per diskette or floppy, actual cost for samples/models. "
-            "Inspection of records: Rs. 5 per hour (first hour free). "
-            "First Appeal: FREE — no fee. "
-            "Second Appeal to CIC/SIC: FREE — no fee. "
-            "If PIO misses 30-day deadline under Section 7(5): ALL information provided free of cost. "
-            "State governments set their own fee schedules — some states charge Rs. 10, others charge differently."
-        ),
-    },
-    {
-        "id": "rti_appeals_process",
-        "topic": "RTI",
-        "section": "Appeals — First and Second",
-        "text": (
-            "RTI Act 2005 — Appeals Process: "
-            "Section 19(1) — First Appeal: File with the First Appellate Authority (an officer senior to the PIO "
-            "in the same department) within 30 days of receiving an unsatisfactory reply or 30+30=60 days from filing "
-            "if no reply. First Appeal is FREE. The First Appellate Authority must decide within 30 days (extendable to 45). "
-            "Section 19(3) — Second Appeal: If First Appeal fails or no response, file with the Central Information Commission (CIC) "
-            "for central government, or State Information Commission (SIC) for state government. "
-            "File within 90 days of the First Appellate Authority's order. FREE. "
-            "Section 19(8): CIC/SIC can require the public authority to disclose information, appoint a new PIO, "
-            "publish certain information, or compensate the complainant. "
-            "Section 20 — Penalty: CIC/SIC can impose a penalty of Rs. 250 per day of delay on the PIO, "
-            "up to a maximum of Rs. 25,000. Disciplinary action can also be recommended."
-        ),
-    },
-    {
-        "id": "rti_exemptions",
-        "topic": "RTI",
-        "section": "Exemptions from Disclosure",
-        "text": (
-            "RTI Act 2005 — What Information Can Be Withheld (Section 8): "
-            "Section 8(1)(a): National security, sovereignty, strategic/scientific interest. "
-            "Section 8(1)(b): Information that courts have forbidden from publication. "
-            "Section 8(1)(c): Parliamentary privilege. "
-            "Section 8(1)(d): Commercial confidence, trade secrets, intellectual property. "
-            "Section 8(1)(e): Information held in fiduciary relationship (e.g., advice given to ministers). "
-            "Section 8(1)(g): Information that would endanger the life of a person. "
-            "Section 8(1)(h): Information that would impede ongoing investigation or prosecution. "
-            "Section 8(1)(j): Personal information with no public interest — frequently misused by public authorities; "
-            "CIC has held that salary, assets, and conduct of public servants IS disclosable. "
-            "Section 8(2): Even exempt information must be disclosed if there is overriding public interest. "
-            "Third-Party Information (Section 11): PIO must give 5 days notice to the third party before disclosing."
-        ),
-    },
-
-                                                                             
-    {
-        "id": "dv_definition_types",
-        "topic": "Domestic Violence",
-        "section": "Definition and Types of Abuse",
-        "text": (
-            "Protection of Women from Domestic Violence Act 2005 (PWDVA) — What Counts as Domestic Violence: "
-            "Section 3 defines domestic violence to include: "
-            "Physical Abuse: Any act causing bodily pain, harm, or danger to life — hitting, slapping, kicking, "
-            "punching, pushing, burning, biting, hair-pulling, use of weapons. "
-            "Sexual Abuse: Any conduct of a sexual nature that humiliates, degrades, or violates dignity. "
-            "Verbal and Emotional Abuse: Insults, ridicule, humiliation, name-calling, threats of physical harm, "
-            "threats to take away children, threats of divorce, controlling behaviour, isolating from family. "
-            "Economic Abuse (Section 3(iv)): Depriving the woman of financial resources she is entitled to, "
-            "refusing to pay rent, forcing her to leave the shared household, disposing of stridhan/property. "
-            "Dowry Demands (Section 3(iv)(c)): Repeated demands for dowry or valuable property constitute "
-            "domestic violence. This is SEPARATE from the Dowry Prohibition Act 1961."
-        ),
-    },
-    {
-        "id": "dv_who_can_file_officials",
-        "topic": "Domestic Violence",
-        "section": "Who Can File and Key Officials",
-        "text": (
-            "PWDVA 2005 — Who Can File and Key Officials: "
-            "Section 2(a) — Aggrieved Person: Any woman who is or has been in a domestic relationship "
-            "and alleges domestic violence. Includes wife, live-in partner, sister, mother, daughter. "
-            "Section 2(q) — Respondent: Male adult member of the household or relatives of the husband/partner. "
-            "Who can approach: The woman herself, any person on her behalf, a child of the aggrieved woman, "
-            "a Protection Officer, or a police officer. "
-            "Protection Officer (Section 9): Appointed by State Government. Service is FREE. "
-            "Duties: Prepare DIR, assist in court, arrange shelter/medical aid, ensure safety plan. "
-            "Service Provider (Section 10): Registered NGOs can receive complaints, provide shelter, legal aid. "
-            "Magistrate (Section 12): Any Judicial/Metropolitan Magistrate has jurisdiction. "
-            "The aggrieved woman can file directly with the Magistrate, bypassing the Protection Officer."
-        ),
-    },
-    {
-        "id": "dv_dir_filing",
-        "topic": "Domestic Violence",
-        "section": "Domestic Incident Report Filing",
-        "text": (
-            "PWDVA 2005 — Filing the Domestic Incident Report (DIR) and Approaching the Magistrate: "
-            "Step 1: Contact Protection Officer at the district court or Police Station or DLSA (District Legal Services Authority) — FREE. "
-            "Step 2: Protection Officer is LEGALLY OBLIGATED under Section 9(b) to prepare the DIR in Form I. "
-            "DIR can also be prepared by a Service Provider under Section 10(2)(c). "
-            "Step 3: Protection Officer files the DIR with the Magistrate under Section 12. "
-            "You can also directly file a petition/application under Section 12(1) to the Magistrate yourself. "
-            "Section 12(4): Magistrate MUST fix the first hearing date within 3 DAYS of receiving application. "
-            "Section 12(5): All proceedings must be disposed of within 60 DAYS. "
-            "All proceedings are held in camera (private) to protect dignity — Section 16. "
-            "EMERGENCY: Call Women Helpline 181 (24x7) or Police 100. Police MUST assist under Section 5."
-        ),
-    },
-    {
-        "id": "dv_court_orders",
-        "topic": "Domestic Violence",
-        "section": "Court Orders Available",
-        "text": (
-            "PWDVA 2005 — Orders the Magistrate Can Pass: "
-            "Protection Order (Section 18): Prohibits respondent from committing DV, entering victim's workplace "
-            "or school, contacting or communicating with the victim, alienating her assets or stridhan. "
-            "Violation of a Protection Order is a CRIMINAL OFFENCE — Section 31 — imprisonment up to 1 year "
-            "or fine up to Rs. 20,000 or both. "
-            "Residence Order (Section 19): Respondent must vacate the shared household. The victim CANNOT be "
-            "dispossessed from the shared household even if she has no ownership. The respondent must provide "
-            "alternative accommodation of same standard. "
-            "Monetary Relief (Section 20): Covers loss of earnings, medical expenses, maintenance for herself "
-            "and children, and cost of rented accommodation. Paid by the respondent. "
-            "Custody Order (Section 21): Interim custody of children to the aggrieved person. "
-            "Compensation and Damages (Section 22): Lump-sum compensation for physical/mental injuries, "
-            "emotional distress, and mental torture caused by domestic violence."
-        ),
-    },
-    {
-        "id": "dv_criminal_remedies",
-        "topic": "Domestic Violence",
-        "section": "Criminal Law Remedies",
-        "text": (
-            "Parallel Criminal Remedies for Domestic Violence Victims: "
-            "Section 498A IPC (now Section 85 BNS 2023): Cruelty by husband or relatives. "
-            "Cognizable (police can arrest without warrant), non-bailable. Imprisonment up to 3 years + fine. "
-            "Section 304B IPC (now Section 80 BNS 2023): Dowry death — woman dies within 7 years of marriage "
-            "in suspicious circumstances. Minimum 7 years imprisonment, maximum life. Presumption against husband. "
-            "Section 323/325 IPC (now Sections 115/117 BNS): Simple/grievous hurt — up to 1 to 7 years. "
-            "Section 354 IPC (now Section 74 BNS): Assault or criminal force to outrage modesty. "
-            "Section 506 IPC (now Section 351 BNS): Criminal intimidation — threats. "
-            "Dowry Prohibition Act 1961: Section 4 — demanding dowry punishable by minimum 6 months imprisonment "
-            "and fine of Rs. 5,000 minimum. "
-            "HELPLINES: National Women Helpline: 181 (free, 24x7) | Police: 100 | "
-            "National Commission for Women: 011-26942369 | District Legal Services Authority (DLSA): Free legal aid."
-        ),
-    },
-
-                                                                            
-    {
-        "id": "divorce_eligibility_types",
-        "topic": "Divorce",
-        "section": "Eligibility and Types of Divorce",
-        "text": (
-            "Hindu Marriage Act 1955 — Divorce: Types and Eligibility: "
-            "Mutual Consent Divorce — Section 13B: Both spouses agree. Must have lived separately for AT LEAST 1 YEAR. "
-            "Both must appear before the Family Court. Faster, less adversarial. "
-            "Contested Divorce — Section 13: Grounds include cruelty (Section 13(1)(ia)), adultery (Section 13(1)(i)), "
-            "desertion for 2+ years (Section 13(1)(ib)), conversion to another religion, mental disorder, "
-            "venereal disease, renunciation of the world, presumption of death. "
-            "Special Marriage Act 1954 — Section 28: Mutual consent divorce for inter-religious marriages. "
-            "Similar to 13B but requires 1-year separation. "
-            "Muslim Personal Law: Talaq-e-Ahsan (most approved form — 3 monthly periods), Khula (wife-initiated). "
-            "Triple Talaq is ABOLISHED — Muslim Women (Protection of Rights on Marriage) Act 2019. "
-            "Christian Divorce: Indian Divorce Act 1869 — Section 10A: Mutual consent, 2-year separation required."
-        ),
-    },
-    {
-        "id": "divorce_procedure_steps",
-        "topic": "Divorce",
-        "section": "Step-by-Step Mutual Consent Procedure",
-        "text": (
-            "Section 13B, Hindu Marriage Act 1955 — Mutual Consent Divorce Procedure: "
-            "Pre-Requisites: Both must agree. Must have lived separately for 1 year or more IMMEDIATELY before filing. "
-            "Step 1 — Settlement: Before filing, BOTH parties must settle in a Memorandum of Understanding (MOU): "
-            "alimony amount and payment schedule, child custody and visitation rights, return of stridhan, "
-            "division of property. Courts insist on complete settlement to avoid future disputes. "
-            "Step 2 — Engage Advocate: Draft joint petition signed by BOTH spouses. "
-            "Step 3 — File in Family Court: Jurisdiction = where marriage was solemnized OR where the respondent "
-            "resides OR where parties last lived together. Court fee: approximately Rs. 200-500. "
-            "Step 4 — First Motion (Section 13B(1)): Both appear before judge on same day. Statements recorded on oath. "
-            "First Motion granted. A 6-month cooling-off period begins. "
-            "Step 5 — Second Motion (Section 13B(2)): Must be filed within 18 months of First Motion. "
-            "Both appear again to confirm consent. Decree of Divorce passed immediately. "
-            "Cooling-Off Waiver: Supreme Court in Amardeep Singh v. Harveen Kaur (2017) — courts CAN waive "
-            "the 6-month period if: marriage is irretrievably broken, all issues settled, waiting would prolong suffering."
-        ),
-    },
-    {
-        "id": "divorce_alimony_maintenance",
-        "topic": "Divorce",
-        "section": "Alimony and Maintenance",
-        "text": (
-            "Alimony and Maintenance Laws in India — Divorce Context: "
-            "Section 24, Hindu Marriage Act 1955: Maintenance pendente lite — maintenance DURING the divorce proceedings "
-            "for whichever spouse earns less. Either husband or wife can claim. Court passes order within 60 days. "
-            "Section 25, HMA 1955: Permanent alimony — lump sum or monthly amount awarded AFTER divorce decree. "
-            "Court considers: income and property of both parties, conduct of the parties, other circumstances. "
-            "Either spouse can claim. Can be revisited if circumstances change. "
-            "Section 125, CrPC (now Section 144 BNSS 2023): Magistrate can order monthly maintenance for wife, "
-            "children, and parents — Rs. amount determined by court. Can be obtained quickly even before Family Court divorce. "
-            "Women can file under BOTH Section 125 CrPC AND Hindu Marriage Act simultaneously. "
-            "Stridhan: All jewellery, gifts, and property given to the wife at or before/ after marriage from any source "
-            "is her absolute property — Supreme Court in Pratibha Rani v. Suraj Kumar (1985). "
-            "Husband has NO right to stridhan even during marriage."
-        ),
-    },
-    {
-        "id": "divorce_child_custody",
-        "topic": "Divorce",
-        "section": "Child Custody",
-        "text": (
-            "Child Custody Laws in India — Divorce Context: "
-            "Section 26, Hindu Marriage Act 1955: Court can pass interim or permanent custody orders at any stage, "
-            "even before the divorce decree. Best interest of the child is the paramount consideration. "
-            "Guardians and Wards Act 1890: The applicable law for custody disputes. Section 13 — welfare of the minor is first. "
-            "General Practice: Mother usually gets custody of children below 5 years (tender years doctrine). "
-            "For children above 5, the court considers: the child's own preference (if old enough), "
-            "stability of home, financial capacity of each parent, relationship with siblings. "
-            "Father has the right to visitation even when mother has custody. "
-            "NRI Custody: If one parent takes child abroad without consent, the other parent can file a Habeas Corpus petition "
-            "in the High Court. India is not a signatory to the Hague Convention. "
-            "Interim Custody: Can be obtained urgently from the Family Court within days of filing. "
-            "Section 21, PWDVA 2005: Even in domestic violence cases, the Magistrate can grant temporary custody."
-        ),
-    },
-    {
-        "id": "divorce_nri_special",
-        "topic": "Divorce",
-        "section": "NRI Divorce and Other Special Situations",
-        "text": (
-            "Special Divorce Situations — NRI, Muslim, Christian: "
-            "NRI Divorce (Hindu Marriage Act): Section 19 — petition can be filed in India even if one party is abroad. "
-            "The spouse abroad can appoint a Power of Attorney holder to appear in court during proceedings, "
-            "but MUST appear in person for the Final Hearing. "
-            "Foreign Divorce Decrees: Not automatically valid in India. Must be enforced through Indian courts. "
-            "Muslim Divorce: Triple talaq ABOLISHED under Muslim Women (Protection of Rights on Marriage) Act 2019 — "
-            "instant triple talaq is a CRIMINAL OFFENCE with up to 3 years imprisonment. "
-            "Dissolution of Muslim Marriages Act 1939: Wife can seek divorce on grounds of husband's whereabouts unknown, "
-            "failure to maintain, imprisonment, cruelty, impotency, mental disorder, leprosy. "
-            "Khula: Wife-initiated divorce — she typically returns mehr (dower) received at nikah. "
-            "Christian Divorce: Indian Divorce Act 1869 as amended — Section 10A mutual consent requires 2-year separation."
-        ),
-    },
-]
+# Demo mode never retrieves, so it never loads (or downloads) the ONNX model.
+_embed_fn = None if DEMO_MODE else NyayaEmbeddingFunction()
 
                                                                              
                                                         
                                                                              
 
 
-def _build_vector_store() -> chromadb.Collection:
-    """Embed all legal chunks and store in an in-memory ChromaDB collection."""
-    try:
-        _chroma_client.delete_collection("nyaya_legal")
-    except Exception:
-        pass
-
-    collection = _chroma_client.create_collection(
-        name="nyaya_legal",
-        embedding_function=_embed_fn,
-        metadata={"hnsw:space": "cosine"},
-    )
-    collection.add(
-        ids=[c["id"] for c in LEGAL_CHUNKS],
-        documents=[c["text"] for c in LEGAL_CHUNKS],
-        metadatas=[{"topic": c["topic"], "section": c["section"]} for c in LEGAL_CHUNKS],
-    )
-    return collection
+def _load_chunk_vecs() -> np.ndarray:
+    """
+    Unit-normalised LEGAL_CHUNKS embeddings for _top_chunks, read from the
+    precomputed legal_embeddings.npz. The chunks are only re-embedded (and
+    the file rewritten) when it is missing or stale for the chunks + model.
+    """
+    embeddings = load_embeddings(_embed_fn.model_tag)
+    if embeddings is None:
+        embeddings = np.asarray(_embed_fn(LEGAL_TEXTS), dtype=np.float32)
+        try:
+            save_embeddings(embeddings, _embed_fn.model_tag)
+        except OSError:
+            pass
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
 
 
-                                                                         
-_collection: chromadb.Collection = _build_vector_store()
+_EMBED_BATCH = 8
+_EMBED_WINDOW = 0.005
+_embed_queue: asyncio.Queue | None = None
+_embed_task: asyncio.Task | None = None
 
 
-def semantic_retrieve(query: str, n_results: int = 4) -> str:
+async def _embed_coalesced(text: str):
     """
-    Embed the user's query and return the top-n most semantically relevant
-    legal chunk texts, joined together as a single context string.
+    Embed one query. Queries that arrive within _EMBED_WINDOW of each other
+    (or while a forward pass is running) share one batched ONNX call.
     """
-    results = _collection.query(
-        query_texts=[query],
-        n_results=n_results,
-        include=["documents", "metadatas"],
-    )
-    docs = results["documents"][0]                             
-    metas = results["metadatas"][0]                               
-    context_parts = []
-    for doc, meta in zip(docs, metas):
-        context_parts.append(f"[{meta['topic']} — {meta['section']}]\n{doc}")
-    return "\n\n".join(context_parts)
+    global _embed_queue, _embed_task
+    if _embed_task is None or _embed_task.done():
+        _embed_queue = asyncio.Queue()
+        _embed_task = asyncio.create_task(_embed_batches(_embed_queue))
+    future = asyncio.get_running_loop().create_future()
+    await _embed_queue.put((text, future))
+    return await future
+
+
+async def _embed_batches(queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + _EMBED_WINDOW
+        while len(batch) < _EMBED_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        try:
+            vectors = await asyncio.to_thread(_embed_fn, [text for text, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            continue
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+
+def _normalize_query(query: str) -> str:
+    # MiniLM's tokenizer is uncased and ignores whitespace runs, so these
+    # variants embed identically and can share cache entries.
+    return " ".join(query.lower().split())
+
+
+async def _embed_query(normalized: str) -> np.ndarray:
+    """Unit-length query embedding (via the batching embedder)."""
+    vector = np.asarray(await _embed_coalesced(normalized), dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _top_chunks(query_vec: np.ndarray, n: int, min_score: float | None = None) -> np.ndarray:
+    # Exact cosine ranking over the whole corpus: one (N, 384) @ (384,)
+    # product is cheaper than an HNSW search at this size.
+    scores = _chunk_vecs @ query_vec
+    top = np.argsort(-scores)[:n]
+    if min_score is None:
+        return top
+    # Drop weak matches, but always keep the best chunk.
+    keep = scores[top] >= min_score
+    keep[0] = True
+    return top[keep]
+
+
+                                                                         
+_chunk_vecs: np.ndarray | None = None  # loaded in lifespan()
+_web_client: httpx.AsyncClient | None = None
 
 
                                                                              
@@ -432,6 +287,9 @@ AUDIO_MIME_MAP = {
 }
 
 
+# Upload suffixes are a tiny, bounded set, so the .lower() copy and the dict
+# probe happen once per distinct suffix.
+@lru_cache(maxsize=32)
 def get_mime_type(suffix: str) -> str:
     return AUDIO_MIME_MAP.get(suffix.lower(), "audio/webm")
 
@@ -523,6 +381,10 @@ DEMO_RESPONSES = {
 }
 
 
+# Full /api/process demo bodies (response + pdf_url), built in lifespan().
+_DEMO_BODIES: dict[str, bytes] = {}
+
+
 def _demo_process(intent_key: str = "RTI") -> dict:
     return DEMO_RESPONSES.get(intent_key, DEMO_RESPONSES["RTI"])
 
@@ -546,7 +408,7 @@ class IntentResult(BaseModel):
     follow_up_question: str = Field(default="", description="One clarifying question. Empty string if not needed.")
     context_source: str = Field(
         default="RAG",
-        description="'WEB' if context came from live government portal fetch, 'RAG' if from ChromaDB fallback, 'WEB+RAG' if both"
+        description="'WEB' if context came from live government portal fetch, 'RAG' if from the local legal-chunk retrieval fallback, 'WEB+RAG' if both"
     )
     sources_used: List[str] = Field(
         default=[],
@@ -554,7 +416,14 @@ class IntentResult(BaseModel):
     )
 
 
-from form_pdf_builder import build_rti_pdf, build_dv_pdf, build_divorce_pdf
+from form_pdf_builder import (
+    FormPDF,
+    build_rti_pdf_async,
+    build_dv_pdf_async,
+    build_divorce_pdf_async,
+    save_pdf_async,
+    warm_up_async,
+)
 
 
 class GeneratePdfRequest(BaseModel):
@@ -613,6 +482,16 @@ class DVFormData(BaseModel):
     relief_monetary_amount: str | None = None
     relief_custody: bool = False
 
+    @field_validator("nature_of_violence", mode="before")
+    @classmethod
+    def _violence_as_list(cls, value):
+        # Same rule as form_pdf_builder._violence_items, applied at the API boundary.
+        if isinstance(value, str):
+            return [value]
+        if isinstance(value, list):
+            return [v for v in value if isinstance(v, str)]
+        return []
+
 
 class DivorceFormData(BaseModel):
     petitioner1_name: str | None = None
@@ -722,6 +601,18 @@ _DIVORCE_SCHEMA = """{
   "property_settled": string|null
 }"""
 
+# FORM_EXTRACT_PROMPT with each intent's schema already substituted, split
+# around __TEXT__ so a request only concatenates the user's statement in.
+_FORM_PROMPTS: dict[str, tuple[str, str]] = {
+    intent: tuple(FORM_EXTRACT_PROMPT.replace("__SCHEMA__", schema).split("__TEXT__"))
+    for intent, schema in (
+        ("RTI", _RTI_SCHEMA),
+        ("Domestic Violence", _DV_SCHEMA),
+        ("Divorce", _DIVORCE_SCHEMA),
+    )
+}
+_FORM_PROMPT_FALLBACK = _FORM_PROMPTS["RTI"]
+
                                               
 _RTI_QUESTIONS = {
     "name": "What is your full name?",
@@ -775,22 +666,29 @@ _DIVORCE_QUESTIONS = {
 }
 
 
+# Per intent: (field, question, is_list) for every field we ask about; list
+# fields (schema "array of ...") also count as missing when empty.
+_MISSING_CHECKS: dict[str, tuple[tuple[str, str, bool], ...]] = {
+    intent: tuple(
+        (field, question, f'"{field}": array of' in schema)
+        for field, question in questions.items()
+    )
+    for intent, schema, questions in (
+        ("RTI", _RTI_SCHEMA, _RTI_QUESTIONS),
+        ("Domestic Violence", _DV_SCHEMA, _DV_QUESTIONS),
+        ("Divorce", _DIVORCE_SCHEMA, _DIVORCE_QUESTIONS),
+    )
+}
+
+
 def _get_missing(data: dict, intent: str) -> tuple[list[str], list[str]]:
     """Return (missing_field_names, missing_questions) for fields that are null."""
-    q_map = {
-        "RTI": _RTI_QUESTIONS,
-        "Domestic Violence": _DV_QUESTIONS,
-        "Divorce": _DIVORCE_QUESTIONS,
-    }.get(intent, {})
-
-    missing_fields = []
-    missing_questions = []
-    for field, question in q_map.items():
-        val = data.get(field)
-        if val is None or (isinstance(val, list) and len(val) == 0):
-            missing_fields.append(field)
-            missing_questions.append(question)
-    return missing_fields, missing_questions
+    missing = [
+        (field, question)
+        for field, question, is_list in _MISSING_CHECKS.get(intent, ())
+        if (val := data.get(field)) is None or (is_list and not val)
+    ]
+    return [field for field, _ in missing], [question for _, question in missing]
 
 
                                                                              
@@ -840,33 +738,108 @@ JSON schema:
 }"""
 
 
+_CONTEXT_SEMAPHORE = asyncio.Semaphore(8)
+# Retrieved chunks scoring below this cosine similarity are left out of the
+# LLM context: they add prefill tokens without adding relevant law.
+_MIN_CONTEXT_SCORE = 0.35
+
+# Finished analyses, reused only for the exact same question (normalized
+# text): the answer is written for the user's own wording, so a merely
+# similar question always gets a fresh one. Entries expire with the portal
+# text they were built from (CACHE_TTL), and RAG-only answers (portals down)
+# are not kept at all, so the next ask retries the portals.
+_ANALYSIS_CACHE_SIZE = 512
+_analysis_exact: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+
+
+def _cached_analysis(key: str) -> dict | None:
+    entry = _analysis_exact.get(key)
+    if entry is None:
+        return None
+    result, ts = entry
+    if time.time() - ts >= CACHE_TTL:
+        del _analysis_exact[key]
+        return None
+    _analysis_exact.move_to_end(key)
+    return result
+
+
+def _remember_analysis(key: str, result: dict) -> None:
+    if result["context_source"] == "RAG":
+        return
+    _analysis_exact[key] = (result, time.time())
+    if len(_analysis_exact) > _ANALYSIS_CACHE_SIZE:
+        _analysis_exact.popitem(last=False)
+
+
+_inflight_completions: dict[bytes, asyncio.Task] = {}
+
+
+async def _chat_json(messages: list[dict], temperature: float):
+    async with _GROQ_SEMAPHORE:
+        return await asyncio.wait_for(
+            groq_client.chat.completions.create(
+                model="llama-3.3-70b-versatile",
+                messages=messages,
+                response_format={"type": "json_object"},
+                temperature=temperature,
+            ),
+            _GROQ_CALL_BUDGET,
+        )
+
+
+async def _complete_json(messages: list[dict], temperature: float) -> str:
+    """
+    One JSON-mode Llama 3.3 completion, returned as the raw JSON string.
+    Identical concurrent requests (same messages and temperature) share a
+    single in-flight Groq call instead of each paying for their own.
+    """
+    key = orjson.dumps([temperature, messages])
+    task = _inflight_completions.get(key)
+    if task is None:
+        task = asyncio.create_task(_chat_json(messages, temperature))
+        _inflight_completions[key] = task
+        task.add_done_callback(lambda _: _inflight_completions.pop(key, None))
+    # Shielded so one client disconnecting does not cancel the call for the rest.
+    response = await asyncio.shield(task)
+    return response.choices[0].message.content
+
+
 async def _call_groq_analyze(text: str) -> IntentResult:
     """
     Web-first, RAG-fallback context pipeline:
-      1. Run ChromaDB semantic search to get top-3 relevant legal chunks
-         AND detect the dominant intent (from the top chunk's topic).
-      2. Concurrently attempt a live web fetch from official government portals
-         for that intent.
+      0. Return a cached analysis for the same question.
+      1. Embed the text once; rank the top-3 legal chunks (dropping any
+         below _MIN_CONTEXT_SCORE except the best) and take the dominant
+         intent from the top chunk's topic. Skipped in DEMO_MODE, which
+         analyses with an empty context.
+      2. Attempt a live web fetch from official government portals for that
+         intent.
       3. Fuse web content + RAG chunks as context for the LLM.
          - If web fetch succeeds  → context_source = "WEB+RAG"
          - If web fetch fails     → context_source = "RAG"  (pure fallback)
       4. Call Groq Llama 3.3-70b with the fused context.
     """
-                                                                            
-    rag_context = semantic_retrieve(text, n_results=3)
+    key = _normalize_query(text)
+    cached = _cached_analysis(key)
+    if cached is not None:
+        return IntentResult(**cached)
 
-                                                                 
-    top_results = _collection.query(
-        query_texts=[text],
-        n_results=1,
-        include=["metadatas"],
-    )
-    dominant_intent: str = "RTI"           
-    if top_results["metadatas"] and top_results["metadatas"][0]:
-        dominant_intent = top_results["metadatas"][0][0].get("topic", "RTI")
+    if DEMO_MODE:
+        # No encoder or chunk vectors are loaded; the model answers from the
+        # statement alone, and "Unknown" has no portals to fetch.
+        dominant_intent, rag_context = "Unknown", ""
+    else:
+        query_vec = await _embed_query(key)
+        top = _top_chunks(query_vec, 3, _MIN_CONTEXT_SCORE)
+        dominant_intent = LEGAL_METAS[top[0]]["topic"]
+        rag_context = "\n\n".join(LEGAL_CONTEXTS[i] for i in top)
 
-                                                                            
-    web_context, sources_used = await fetch_government_context(dominant_intent)
+    # Only the detected intent's portals are fetched: starting every intent's
+    # fetch before the embedding would triple portal traffic to hide a few
+    # milliseconds of encoder time behind a round-trip.
+    async with _CONTEXT_SEMAPHORE:
+        web_context, sources_used = await fetch_government_context(dominant_intent, _web_client)
 
                                                                             
     if web_context and len(web_context) >= 300:
@@ -886,31 +859,32 @@ async def _call_groq_analyze(text: str) -> IntentResult:
         )
 
                                                                                    
+    # Most-stable text first: SYSTEM_PROMPT, then the context (identical for
+    # every question that resolves to the same intent and chunks while the
+    # portal cache is warm), and the user's own words last, so requests share
+    # the longest possible prompt prefix for Groq's prefix caching.
     prompt = (
-        f'User\'s statement (translated to English): "{text}"\n\n'
-        f"Context (priority: use government portal data first if available):\n"
+        "Context (priority: use government portal data first if available):\n"
         f"{fused_context}\n\n"
-        f"Produce a specific, legally precise JSON response for this user's exact situation."
+        f'User\'s statement (translated to English): "{text}"\n\n'
+        "Produce a specific, legally precise JSON response for this user's exact situation."
     )
 
-    response = await asyncio.to_thread(
-        groq_client.chat.completions.create,
-        model="llama-3.3-70b-versatile",
-        messages=[
+    data = orjson.loads(await _complete_json(
+        [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ],
-        response_format={"type": "json_object"},
         temperature=0.2,
-    )
-    raw = response.choices[0].message.content
-    data = json.loads(raw)
+    ))
 
                                                        
     data["context_source"] = context_source
     data["sources_used"] = sources_used
 
-    return IntentResult(**data)
+    result = IntentResult(**data)
+    _remember_analysis(key, result.model_dump())
+    return result
 
 
                                                                              
@@ -918,8 +892,14 @@ async def _call_groq_analyze(text: str) -> IntentResult:
                                                                              
 
 
-def _build_pdf(data: GeneratePdfRequest, pdf_path: Path) -> None:
-    pdf = FPDF()
+@lru_cache(maxsize=1)
+def _summary_template() -> bytes:
+    """
+    Render the fixed banner of the triage PDF on first use and snapshot it;
+    each _build_pdf call restores a private copy and only draws the answer.
+    FormPDF skips set_font / colour calls that would not change the state.
+    """
+    pdf = FormPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.add_page()
 
@@ -929,16 +909,35 @@ def _build_pdf(data: GeneratePdfRequest, pdf_path: Path) -> None:
     pdf.set_font("Helvetica", "B", 18)
     pdf.set_text_color(255, 255, 255)
     pdf.set_xy(10, 8)
-    pdf.cell(0, 12, "PROJECT NYAYA — Legal Triage Document", ln=True)
+    pdf.cell(0, 12, "PROJECT NYAYA -- Legal Triage Document", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_font("Helvetica", "", 11)
     pdf.set_xy(10, 20)
-    pdf.cell(0, 6, "This document is for informational purposes only. It is NOT legal advice.", ln=True)
+    pdf.cell(0, 6, "This document is for informational purposes only. It is NOT legal advice.", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    return pickle.dumps(pdf, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# Helvetica is a Latin-1 core font: typographic punctuation (as used in
+# DEMO_RESPONSES and by the model) gets an ASCII stand-in, and anything else
+# outside Latin-1 becomes "?" instead of failing the whole document.
+_LATIN1_FALLBACKS = str.maketrans({
+    "\u2014": "--", "\u2013": "-", "\u2018": "'", "\u2019": "'",
+    "\u201c": '"', "\u201d": '"', "\u2026": "...", "\u2022": "-", "\u20b9": "Rs. ",
+})
+
+
+def _latin1(text: str) -> str:
+    return text.translate(_LATIN1_FALLBACKS).encode("latin-1", "replace").decode("latin-1")
+
+
+def _build_pdf(data: GeneratePdfRequest, pdf_path: Path) -> None:
+    pdf = pickle.loads(_summary_template())
+    pdf.set_creation_date(datetime.now(timezone.utc))
 
                   
     pdf.set_text_color(30, 58, 138)
     pdf.set_font("Helvetica", "B", 14)
     pdf.set_xy(10, 34)
-    pdf.cell(0, 8, f"Detected Intent: {data.intent_detected.upper()}", ln=True)
+    pdf.cell(0, 8, f"Detected Intent: {_latin1(data.intent_detected.upper())}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     pdf.set_draw_color(203, 213, 225)
     pdf.line(10, 44, 200, 44)
@@ -947,40 +946,37 @@ def _build_pdf(data: GeneratePdfRequest, pdf_path: Path) -> None:
     pdf.set_text_color(30, 41, 59)
     pdf.set_font("Helvetica", "B", 11)
     pdf.set_xy(10, 48)
-    pdf.cell(0, 7, "Summary of Your Issue:", ln=True)
+    pdf.cell(0, 7, "Summary of Your Issue:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_font("Helvetica", "", 10)
     pdf.set_xy(10, 56)
-    pdf.multi_cell(190, 6, data.extracted_user_issue)
+    pdf.multi_cell(190, 6, _latin1(data.extracted_user_issue))
 
                  
     y = pdf.get_y() + 4
     pdf.set_font("Helvetica", "B", 11)
     pdf.set_xy(10, y)
-    pdf.cell(0, 7, "What This Means:", ln=True)
+    pdf.cell(0, 7, "What This Means:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_font("Helvetica", "", 10)
-    pdf.set_xy(10, pdf.get_y())
-    pdf.multi_cell(190, 6, data.simplified_explanation)
+    pdf.multi_cell(190, 6, _latin1(data.simplified_explanation))
 
                    
     if data.relevant_acts:
         y = pdf.get_y() + 4
         pdf.set_font("Helvetica", "B", 11)
         pdf.set_xy(10, y)
-        pdf.cell(0, 7, "Applicable Laws and Sections:", ln=True)
+        pdf.cell(0, 7, "Applicable Laws and Sections:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         pdf.set_font("Helvetica", "", 9)
         for act in data.relevant_acts:
-            pdf.set_xy(10, pdf.get_y())
-            pdf.multi_cell(190, 6, f"  \u00a7 {act}")
+            pdf.multi_cell(190, 6, f"  \u00a7 {_latin1(act)}", new_x=XPos.LMARGIN)
 
                   
     y = pdf.get_y() + 4
     pdf.set_font("Helvetica", "B", 11)
     pdf.set_xy(10, y)
-    pdf.cell(0, 7, "Immediate Action Steps:", ln=True)
+    pdf.cell(0, 7, "Immediate Action Steps:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_font("Helvetica", "", 10)
     for i, step in enumerate(data.immediate_action_steps, 1):
-        pdf.set_xy(10, pdf.get_y())
-        pdf.multi_cell(190, 6, f"  {i}. {step}")
+        pdf.multi_cell(190, 6, f"  {i}. {_latin1(step)}", new_x=XPos.LMARGIN)
 
                         
     if data.follow_up_question:
@@ -990,7 +986,7 @@ def _build_pdf(data: GeneratePdfRequest, pdf_path: Path) -> None:
         pdf.set_text_color(120, 80, 0)
         pdf.set_font("Helvetica", "B", 9)
         pdf.set_xy(10, y)
-        pdf.multi_cell(190, 6, f"  Clarifying Question: {data.follow_up_question}", border=1, fill=True)
+        pdf.multi_cell(190, 6, f"  Clarifying Question: {_latin1(data.follow_up_question)}", border=1, fill=True)
 
                          
     if data.kill_switch_triggered:
@@ -1012,7 +1008,41 @@ def _build_pdf(data: GeneratePdfRequest, pdf_path: Path) -> None:
     pdf.set_font("Helvetica", "I", 8)
     pdf.set_xy(10, 280)
     pdf.cell(0, 5, "Generated by Project Nyaya | Not a substitute for professional legal counsel", align="C")
-    pdf.output(str(pdf_path))
+    pdf.output(os.fspath(pdf_path))
+
+
+def _summary_pdf(data: GeneratePdfRequest) -> str:
+    """
+    Build the triage PDF for `data` in STATIC_DIR and return its filename.
+    The name is a hash of the payload, so re-downloading the same answer
+    reuses the file already on disk instead of rendering a duplicate.
+    CPU-bound: endpoints call it through asyncio.to_thread.
+    """
+    rendered = data.model_dump_json(exclude={"context_source", "sources_used"})
+    digest = hashlib.blake2b(rendered.encode(), digest_size=16).hexdigest()
+    pdf_filename = f"nyaya_{digest}.pdf"
+    pdf_path = STATIC_DIR / pdf_filename
+    if not pdf_path.exists():
+        # Render under a private name first so a reader never sees a partial file.
+        tmp_path = pdf_path.with_name(f"{pdf_filename}.{uuid.uuid4().hex}.tmp")
+        _build_pdf(data, tmp_path)
+        os.replace(tmp_path, pdf_path)
+    return pdf_filename
+
+
+def _render_demo_bodies() -> dict[str, bytes]:
+    """
+    Render the PDF for each DEMO_RESPONSES entry once and pre-encode the
+    matching /api/process body, so demo requests do no per-call work.
+    """
+    bodies = {}
+    for key in DEMO_RESPONSES:
+        demo = _demo_process(key)
+        pdf_filename = _summary_pdf(
+            GeneratePdfRequest(**{k: v for k, v in demo.items() if k != "transcribed_text"}),
+        )
+        bodies[key] = orjson.dumps({**demo, "pdf_url": f"/static/{pdf_filename}"})
+    return bodies
 
 
                                                                              
@@ -1020,25 +1050,51 @@ def _build_pdf(data: GeneratePdfRequest, pdf_path: Path) -> None:
                                                                              
 
 
+def _groq_error(exc: Exception, what: str) -> HTTPException:
+    """
+    502 for a failed Groq call, 504 when it ran past _GROQ_CALL_BUDGET, or
+    429 (passing on Retry-After) when Groq is still rate limiting after the
+    SDK's retries, so clients back off.
+    """
+    if isinstance(exc, RateLimitError):
+        return HTTPException(
+            status_code=429,
+            detail=f"{what}: upstream rate limit, retry shortly",
+            headers={"Retry-After": exc.response.headers.get("retry-after", "5")},
+        )
+    if isinstance(exc, asyncio.TimeoutError):
+        return HTTPException(status_code=504, detail=f"{what}: upstream timed out")
+    return HTTPException(status_code=502, detail=f"{what}: {exc}")
+
+
+async def _translate_audio(audio: UploadFile) -> str:
+    """
+    Whisper-large-v3 translation of an upload to English text. The upload's
+    spooled file is streamed straight into the multipart body; the suffix is
+    kept on the name, and its MIME type sent with the part, so Groq can tell
+    the container format.
+    """
+    suffix = Path(audio.filename or "audio.webm").suffix or ".webm"
+    audio.file.seek(0)
+    async with _GROQ_SEMAPHORE:
+        response = await asyncio.wait_for(
+            groq_client.audio.translations.create(
+                file=(f"audio{suffix}", audio.file, get_mime_type(suffix)),
+                model="whisper-large-v3",
+                response_format="text",
+            ),
+            _GROQ_CALL_BUDGET,
+        )
+    return str(response).strip()
+
+
 @app.post("/api/transcribe")
 async def transcribe(audio: UploadFile = File(...)):
     """Accept audio blob → Groq Whisper-large-v3 → English transcript."""
-    suffix = Path(audio.filename or "audio.webm").suffix or ".webm"
-    tmp_path = Path(tempfile.mktemp(suffix=suffix))
     try:
-        tmp_path.write_bytes(await audio.read())
-        with open(tmp_path, "rb") as f:
-            response = groq_client.audio.translations.create(
-                file=(tmp_path.name, f.read()),
-                model="whisper-large-v3",
-                response_format="text",
-            )
-        return {"text": str(response).strip()}
+        return {"text": await _translate_audio(audio)}
     except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"Groq transcription error: {exc}") from exc
-    finally:
-        if tmp_path.exists():
-            tmp_path.unlink()
+        raise _groq_error(exc, "Groq transcription error") from exc
 
 
                                                                              
@@ -1051,10 +1107,10 @@ async def analyze(request: AnalyzeRequest):
     """Text → semantic retrieval → Groq Llama 3.3 → structured IntentResult."""
     try:
         return await _call_groq_analyze(request.text)
-    except json.JSONDecodeError as exc:
+    except orjson.JSONDecodeError as exc:
         raise HTTPException(status_code=500, detail=f"JSON parse error: {exc}") from exc
     except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"Groq analysis error: {exc}") from exc
+        raise _groq_error(exc, "Groq analysis error") from exc
 
 
                                                                              
@@ -1063,11 +1119,27 @@ async def analyze(request: AnalyzeRequest):
 
 
 @app.post("/api/generate_pdf")
-async def generate_pdf(request: GeneratePdfRequest):
-    pdf_id = uuid.uuid4().hex
-    pdf_filename = f"nyaya_{pdf_id}.pdf"
-    _build_pdf(request, STATIC_DIR / pdf_filename)
-    return {"pdf_url": f"/static/{pdf_filename}", "pdf_filename": pdf_filename}
+async def generate_pdf(request: GeneratePdfRequest, inline: bool = False):
+    """
+    Returns { pdf_url, pdf_filename }, or with ?inline=true the PDF file in
+    the same response (sent by FileResponse, so no second /static fetch).
+    """
+    pdf_filename = await asyncio.to_thread(_summary_pdf, request)
+    if inline:
+        return FileResponse(
+            STATIC_DIR / pdf_filename,
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f'inline; filename="{pdf_filename}"',
+                "Cache-Control": _STATIC_CACHE_CONTROL,
+                # Client-supplied, so only a known intent goes into the header
+                # (headers are Latin-1; anything else would fail the response).
+                "X-Intent": (
+                    request.intent_detected if request.intent_detected in GOVERNMENT_SOURCES else "Unknown"
+                ),
+            },
+        )
+    return _OrjsonResponse({"pdf_url": f"/static/{pdf_filename}", "pdf_filename": pdf_filename})
 
 
                                                                              
@@ -1083,50 +1155,31 @@ async def process(audio: UploadFile = File(...)):
     """
                                                                              
     if DEMO_MODE:
-        size = len(await audio.read())
-        demo = _demo_process("RTI" if size < 20000 else "Domestic Violence" if size < 60000 else "Divorce")
-        pdf_id = uuid.uuid4().hex
-        pdf_filename = f"nyaya_{pdf_id}.pdf"
-        _build_pdf(
-            GeneratePdfRequest(**{k: v for k, v in demo.items() if k != "transcribed_text"}),
-            STATIC_DIR / pdf_filename,
-        )
-        return JSONResponse({**demo, "pdf_url": f"/static/{pdf_filename}"})
+        size = audio.file.seek(0, os.SEEK_END)
+        intent_key = "RTI" if size < 20000 else "Domestic Violence" if size < 60000 else "Divorce"
+        return Response(content=_DEMO_BODIES[intent_key], media_type="application/json")
                                                                              
 
                          
-    suffix = Path(audio.filename or "audio.webm").suffix or ".webm"
-    tmp_path = Path(tempfile.mktemp(suffix=suffix))
     try:
-        tmp_path.write_bytes(await audio.read())
-        with open(tmp_path, "rb") as f:
-            whisper_resp = groq_client.audio.translations.create(
-                file=(tmp_path.name, f.read()),
-                model="whisper-large-v3",
-                response_format="text",
-            )
-        text = str(whisper_resp).strip()
+        text = await _translate_audio(audio)
     except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"Groq transcription error: {exc}") from exc
-    finally:
-        if tmp_path.exists():
-            tmp_path.unlink()
+        raise _groq_error(exc, "Groq transcription error") from exc
 
                                           
     try:
         result = await _call_groq_analyze(text)
-    except json.JSONDecodeError as exc:
+    except orjson.JSONDecodeError as exc:
         raise HTTPException(status_code=500, detail=f"JSON parse error: {exc}") from exc
     except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"Groq analysis error: {exc}") from exc
+        raise _groq_error(exc, "Groq analysis error") from exc
 
                   
-    pdf_id = uuid.uuid4().hex
-    pdf_filename = f"nyaya_{pdf_id}.pdf"
-    _build_pdf(GeneratePdfRequest(**result.model_dump()), STATIC_DIR / pdf_filename)
+    data = result.model_dump()
+    pdf_filename = await asyncio.to_thread(_summary_pdf, GeneratePdfRequest(**data))
 
-    return JSONResponse({
-        **result.model_dump(),
+    return _OrjsonResponse({
+        **data,
         "transcribed_text": text,
         "pdf_url": f"/static/{pdf_filename}",
     })
@@ -1144,26 +1197,22 @@ async def debug_retrieve(q: str, n: int = 4):
     Shows which legal chunks were semantically matched for a query.
     Useful for testing and tuning retrieval quality.
     """
-    results = _collection.query(
-        query_texts=[q],
-        n_results=n,
-        include=["documents", "metadatas", "distances"],
-    )
+    if DEMO_MODE:
+        raise HTTPException(status_code=503, detail="Retrieval is disabled in DEMO_MODE")
+    # Same embed + ranking as _call_groq_analyze, so this shows what the LLM sees.
+    query_vec = await _embed_query(_normalize_query(q))
+    top = _top_chunks(query_vec, n)
     return {
         "query": q,
         "retrieved": [
             {
-                "rank": i + 1,
-                "topic": meta["topic"],
-                "section": meta["section"],
-                "distance": round(dist, 4),
-                "preview": doc[:200] + "...",
+                "rank": rank,
+                "topic": LEGAL_METAS[i]["topic"],
+                "section": LEGAL_METAS[i]["section"],
+                "distance": round(1.0 - float(_chunk_vecs[i] @ query_vec), 4),
+                "preview": LEGAL_CONTEXTS[i][:200] + "...",
             }
-            for i, (doc, meta, dist) in enumerate(zip(
-                results["documents"][0],
-                results["metadatas"][0],
-                results["distances"][0],
-            ))
+            for rank, i in enumerate(top, 1)
         ],
     }
 
@@ -1196,6 +1245,12 @@ async def debug_sources(intent: str = None):
                                                                              
 
 
+# Raw Groq JSON per full extraction prompt (schema + user text), so a retry
+# or a repeated statement skips the model call.
+_FORM_CACHE_SIZE = 1024
+_form_cache: OrderedDict[str, str] = OrderedDict()
+
+
 @app.post("/api/extract_form", response_model=FormExtractResponse)
 async def extract_form(request: FormExtractRequest):
     """
@@ -1203,29 +1258,23 @@ async def extract_form(request: FormExtractRequest):
     Uses Groq Llama to extract every form field it can find.
     Returns: extracted fields (nulls for missing), and what questions to ask next.
     """
-    schema_map = {
-        "RTI": _RTI_SCHEMA,
-        "Domestic Violence": _DV_SCHEMA,
-        "Divorce": _DIVORCE_SCHEMA,
-    }
-    schema = schema_map.get(request.intent, _RTI_SCHEMA)
-    prompt = (
-        FORM_EXTRACT_PROMPT
-        .replace("__SCHEMA__", schema)
-        .replace("__TEXT__", request.text)
-    )
+    head, tail = _FORM_PROMPTS.get(request.intent, _FORM_PROMPT_FALLBACK)
+    prompt = head + request.text + tail
 
+    raw = _form_cache.get(prompt)
     try:
-        response = await asyncio.to_thread(
-            groq_client.chat.completions.create,
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            temperature=0.1,
-        )
-        form_data = json.loads(response.choices[0].message.content)
+        if raw is None:
+            raw = await _complete_json(
+                [{"role": "user", "content": prompt}],
+                temperature=0.1,
+            )
+        form_data = orjson.loads(raw)
     except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"Form extraction error: {exc}") from exc
+        raise _groq_error(exc, "Form extraction error") from exc
+    _form_cache[prompt] = raw
+    _form_cache.move_to_end(prompt)
+    if len(_form_cache) > _FORM_CACHE_SIZE:
+        _form_cache.popitem(last=False)
 
     missing_fields, missing_questions = _get_missing(form_data, request.intent)
 
@@ -1243,10 +1292,11 @@ async def extract_form(request: FormExtractRequest):
 
 
 @app.post("/api/generate_form_pdf")
-async def generate_form_pdf(request: dict):
+async def generate_form_pdf(request: dict, inline: bool = False):
     """
     Takes { intent: str, form_data: dict } and generates a filled PDF.
-    Returns { pdf_url, pdf_filename }.
+    Returns { pdf_url, pdf_filename }, or with ?inline=true the PDF itself
+    (nothing is written to disk).
     """
     intent = request.get("intent", "RTI")
     form_data = request.get("form_data", {})
@@ -1257,18 +1307,45 @@ async def generate_form_pdf(request: dict):
 
     try:
         if intent == "RTI":
-            build_rti_pdf(form_data, pdf_path)
+            pdf_bytes = await build_rti_pdf_async(form_data)
         elif intent == "Domestic Violence":
-            build_dv_pdf(form_data, pdf_path)
+            form_data["nature_of_violence"] = DVFormData(
+                nature_of_violence=form_data.get("nature_of_violence"),
+            ).nature_of_violence
+            pdf_bytes = await build_dv_pdf_async(form_data)
         elif intent == "Divorce":
-            build_divorce_pdf(form_data, pdf_path)
+            pdf_bytes = await build_divorce_pdf_async(form_data)
         else:
             raise HTTPException(status_code=400, detail=f"Unknown intent: {intent}")
+        if inline:
+            return Response(
+                content=pdf_bytes,
+                media_type="application/pdf",
+                headers={
+                    "Content-Disposition": f'inline; filename="{pdf_filename}"',
+                    "X-Intent": intent,
+                },
+            )
+        await save_pdf_async(pdf_bytes, pdf_path)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"PDF generation error: {exc}") from exc
 
-    return {
+    return _OrjsonResponse({
         "pdf_url": f"/static/{pdf_filename}",
         "pdf_filename": pdf_filename,
         "intent": intent,
-    }
+    })
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop + httptools come with uvicorn[standard]; uvloop has no Windows build.
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
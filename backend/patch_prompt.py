@@ -1,6 +1,4 @@
-
-with open("main.py", "r", encoding="utf-8") as f:
-    content = f.read()
+import mmap
 
 LANGUAGE_RULE = (
     "LANGUAGE RULE (CRITICAL -- FOLLOW FIRST):\n"
@@ -15,12 +13,20 @@ LANGUAGE_RULE = (
 
 MARKER = "YOUR CORE MISSION: Give SPECIFIC"
 
-if MARKER in content:
-    content = content.replace(MARKER, LANGUAGE_RULE + MARKER, 1)
-    with open("main.py", "w", encoding="utf-8") as f:
-        f.write(content)
+# Search the mapped bytes directly (no decode of the whole file) and splice
+# the rule in at the first match; the map is closed before main.py is rewritten.
+with open("main.py", "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    idx = mm.find(MARKER.encode("utf-8"))
+    if idx != -1:
+        patched = mm[:idx] + LANGUAGE_RULE.encode("utf-8") + mm[idx:]
+    else:
+        start = mm.find(b"SYSTEM_PROMPT")
+        context = mm[start : start + 200] if start != -1 else mm[-1:]
+
+if idx != -1:
+    with open("main.py", "wb") as f:
+        f.write(patched)
     print("PATCHED OK -- language rule added before CORE MISSION")
 else:
     print("ERROR: marker not found")
-    idx = content.find("SYSTEM_PROMPT")
-    print(repr(content[idx : idx + 200]))
+    print(repr(context.decode("utf-8", errors="replace")))
@@ -33,65 +33,54 @@ TS_FILES = [
 
 # ── Python comment stripper (tokenize-based) ──────────────────────────────────
 def strip_python_comments(source: str) -> str:
-    result = []
-    prev_toktype = tokenize.ENCODING
-    last_lineno = -1
-    last_col = 0
+    # Blank each COMMENT token's span to spaces of the same length, copying
+    # everything else through as slices: columns and line structure are kept
+    # exactly, with no per-token string rebuilding.
+    line_starts = [0]
+    nl = source.find("\n")
+    while nl != -1:
+        line_starts.append(nl + 1)
+        nl = source.find("\n", nl + 1)
 
+    pieces = []
+    pos = 0
     tokens = tokenize.generate_tokens(io.StringIO(source).readline)
-    for tok_type, tok_string, tok_start, tok_end, _ in tokens:
-        if tok_type == tokenize.COMMENT:
-            continue  # drop the comment token
-        if tok_type == tokenize.STRING:
-            # Keep all string literals (including docstrings)
-            pass
-        if tok_type == tokenize.NEWLINE or tok_type == tokenize.NL:
-            if prev_toktype == tokenize.COMMENT:
-                tok_string = "\n"
-        start_line, start_col = tok_start
-        if start_line > last_lineno:
-            result.append("\n" * (start_line - last_lineno - 1))
-            last_col = 0
-        if start_col > last_col:
-            result.append(" " * (start_col - last_col))
-        result.append(tok_string)
-        last_lineno, last_col = tok_end
-        prev_toktype = tok_type
-
-    return "".join(result)
+    for tok_type, _, (start_row, start_col), (end_row, end_col), _ in tokens:
+        if tok_type != tokenize.COMMENT:
+            continue
+        start = line_starts[start_row - 1] + start_col
+        end = line_starts[end_row - 1] + end_col
+        pieces.append(source[pos:start])
+        pieces.append(" " * (end - start))
+        pos = end
+    pieces.append(source[pos:])
+    return "".join(pieces)
 
 
 # ── TypeScript/JS comment stripper (regex-based) ─────────────────────────────
+# Block comments, written as the unrolled loop /\*[^*]*\*+(?:[^/*][^*]*\*+)*/
+# so every character is consumed once: no backtracking, unlike /\*.*?\*/.
+_BLOCK_COMMENT_RE = re.compile(r"/\*[^*]*\*+(?:[^/*][^*]*\*+)*/")
+# One sweep over the whole source: quoted strings are matched (and so kept)
+# whole, an unterminated one running to end of line; // not preceded by ":"
+# (http://) starts a comment, removed along with the whitespace before it.
+# The whitespace run is only tried from its first character, so a long run
+# is not rescanned from every position inside it.
+_LINE_COMMENT_RE = re.compile(
+    r"""('[^'\n]*'?|"[^"\n]*"?)|(?<![^\S\n])[^\S\n]*(?<!:)//[^\n]*"""
+)
+
+
+def _keep_string(m: re.Match) -> str:
+    return m.group(1) or ""
+
+
 def strip_ts_comments(source: str) -> str:
-    # Remove block comments /* ... */ (non-greedy, dotall)
-    source = re.sub(r"/\*.*?\*/", "", source, flags=re.DOTALL)
-    # Remove line comments // ... but NOT inside strings.
-    # Strategy: match strings first, then // comments.
-    # Simple approach: only strip // when not inside a string literal by
-    # removing // to end-of-line, but protect http:// style URLs.
-    def remove_line_comment(line: str) -> str:
-        # Walk the line char by char, tracking string state
-        in_single = False
-        in_double = False
-        i = 0
-        while i < len(line):
-            c = line[i]
-            if c == "'" and not in_double:
-                in_single = not in_single
-            elif c == '"' and not in_single:
-                in_double = not in_double
-            elif c == "/" and not in_single and not in_double:
-                if i + 1 < len(line) and line[i + 1] == "/":
-                    # Check it's not http:// or similar (preceded by :)
-                    if i > 0 and line[i - 1] == ":":
-                        pass  # URL -- keep
-                    else:
-                        return line[:i].rstrip()
-            i += 1
-        return line
-
-    lines = source.splitlines()
-    cleaned = [remove_line_comment(l) for l in lines]
+    source = _BLOCK_COMMENT_RE.sub("", source)
+    # Normalise line endings first (as splitlines does) so the sweep only
+    # needs to know about "\n".
+    source = "\n".join(source.splitlines())
+    cleaned = _LINE_COMMENT_RE.sub(_keep_string, source).split("\n")
     # Collapse 3+ consecutive blank lines into 2
     result = []
     blank_run = 0
@@ -107,33 +96,37 @@ def strip_ts_comments(source: str) -> str:
 
 
 # ── Run ───────────────────────────────────────────────────────────────────────
-total = 0
-for path in PY_FILES:
+def _process_py(path: Path) -> tuple[str, bool]:
+    """Strip one Python file in place; return (report line, processed)."""
     if not path.exists():
-        print(f"  SKIP (not found): {path.name}")
-        continue
+        return f"  SKIP (not found): {path.name}", False
     src = path.read_text(encoding="utf-8")
     try:
         stripped = strip_python_comments(src)
     except tokenize.TokenError as e:
-        print(f"  ERROR tokenizing {path.name}: {e}")
-        continue
+        return f"  ERROR tokenizing {path.name}: {e}", False
     path.write_text(stripped, encoding="utf-8")
     before = src.count("\n")
     after = stripped.count("\n")
-    print(f"  PY  {path.name}: {before - after} comment lines removed")
-    total += 1
+    return f"  PY  {path.name}: {before - after} comment lines removed", True
+
 
-for path in TS_FILES:
+def _process_ts(path: Path) -> tuple[str, bool]:
+    """Strip one TS/TSX/JS file in place; return (report line, processed)."""
     if not path.exists():
-        print(f"  SKIP (not found): {path.name}")
-        continue
+        return f"  SKIP (not found): {path.name}", False
     src = path.read_text(encoding="utf-8")
     stripped = strip_ts_comments(src)
     path.write_text(stripped, encoding="utf-8")
     before = src.count("\n")
     after = stripped.count("\n")
-    print(f"  TS  {path.name}: {before - after} comment lines removed")
-    total += 1
+    return f"  TS  {path.name}: {before - after} comment lines removed", True
+
+
+if __name__ == "__main__":
+    total = 0
+    for line, processed in [*map(_process_py, PY_FILES), *map(_process_ts, TS_FILES)]:
+        print(line)
+        total += processed
 
-print(f"\nDone -- {total} files processed.")
+    print(f"\nDone -- {total} files processed.")
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import form_pdf_builder as fpb
+
+BACKEND_DIR = Path(__file__).parent
+
+
+class _RecordingPDF(fpb.FormPDF):
+    def __init__(self):
+        super().__init__()
+        self.text_colors = []
+        self.add_page()
+
+    def set_text_color(self, r, g=-1, b=-1):
+        self.text_colors.append((r, g, b))
+        super().set_text_color(r, g, b)
+
+
+def test_row2_colours_each_value_by_its_own_state():
+    pdf = _RecordingPDF()
+    fpb._row2(pdf, "Phone", "98765 43210", "Email", None)
+    assert pdf.text_colors == [fpb.C_BLACK, fpb.C_FILLED, fpb.C_BLACK, fpb.C_MISSING]
+
+    pdf = _RecordingPDF()
+    fpb._row2(pdf, "Phone", "", "Email", "a@b.in")
+    assert pdf.text_colors == [fpb.C_BLACK, fpb.C_MISSING, fpb.C_BLACK, fpb.C_FILLED]
+
+
+@pytest.mark.parametrize("build", [fpb.build_rti_pdf, fpb.build_dv_pdf, fpb.build_divorce_pdf])
+@pytest.mark.parametrize("data", [
+    {},
+    {
+        "name": "Asha Devi", "complainant_name": "Asha Devi", "petitioner1_name": "Ravi Kumar",
+        "children": [{"name": "Meena", "age": 6}, "Arjun"],
+        "nature_of_violence": ["Physical", "Dowry"],
+    },
+])
+def test_builders_return_pdf_bytes(build, data):
+    assert build(data).startswith(b"%PDF")
+
+
+@pytest.fixture
+def fixed_clock(monkeypatch):
+    """Pin the per-document creation date so renders can be compared byte for byte."""
+    class _Clock(fpb.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return fpb.datetime(2026, 1, 1, tzinfo=fpb.timezone.utc)
+
+    monkeypatch.setattr(fpb, "datetime", _Clock)
+
+
+def test_dv_violence_ticks_checkboxes(fixed_clock):
+    ticked = fpb.build_dv_pdf({"nature_of_violence": ["physical and verbal abuse"]})
+    assert ticked != fpb.build_dv_pdf({})
+    assert ticked == fpb.build_dv_pdf({"nature_of_violence": ["Physical", "Verbal"]})
+    assert fpb.build_dv_pdf({"nature_of_violence": ["Physically abused", "sexually harassed"]}) == (
+        fpb.build_dv_pdf({"nature_of_violence": ["Physical", "Sexual"]})
+    )
+    assert fpb.build_dv_pdf({"nature_of_violence": "physical abuse"}) == (
+        fpb.build_dv_pdf({"nature_of_violence": ["Physical"]})
+    )
+
+
+def test_each_render_gets_its_own_creation_date(monkeypatch):
+    stamps = iter([fpb.datetime(2026, 1, 1, 9, 0, 0, tzinfo=fpb.timezone.utc),
+                   fpb.datetime(2026, 1, 1, 9, 0, 5, tzinfo=fpb.timezone.utc)])
+
+    class _Clock(fpb.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(stamps)
+
+    monkeypatch.setattr(fpb, "datetime", _Clock)
+    dates = [
+        re.search(rb"/CreationDate \(([^)]*)\)", asyncio.run(fpb.build_rti_pdf_async({"name": "Asha"}))).group(1)
+        for _ in range(2)
+    ]
+    assert dates == [b"D:20260101090000Z", b"D:20260101090005Z"]
+
+
+def _import_main(tmp_path: Path, demo: bool, code: str = "") -> subprocess.CompletedProcess:
+    env = {**os.environ, "DEMO_MODE": "true" if demo else "false", "GROQ_API_KEY": "test-key"}
+    script = f"import pathlib, main\nmain.STATIC_DIR = pathlib.Path({str(tmp_path)!r})\n{code}"
+    return subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120,
+    )
+
+
+def test_import_main_normal_mode(tmp_path):
+    result = _import_main(tmp_path, demo=False)
+    assert result.returncode == 0, result.stderr
+
+
+def test_dv_form_data_normalizes_nature_of_violence(tmp_path):
+    result = _import_main(tmp_path, demo=True, code="\n".join([
+        "norm = lambda v: main.DVFormData(nature_of_violence=v).nature_of_violence",
+        "assert norm('physical abuse') == ['physical abuse']",
+        "assert norm(None) == []",
+        "assert norm([None, 'Dowry', 3]) == ['Dowry']",
+    ]))
+    assert result.returncode == 0, result.stderr
+
+
+def test_import_main_demo_mode_renders_demo_bodies(tmp_path):
+    result = _import_main(
+        tmp_path, demo=True,
+        code="bodies = main._render_demo_bodies()\nassert set(bodies) == set(main.DEMO_RESPONSES)",
+    )
+    assert result.returncode == 0, result.stderr
+    pdfs = list(tmp_path.glob("nyaya_*.pdf"))
+    assert len(pdfs) == 3
+    assert all(p.read_bytes().startswith(b"%PDF") for p in pdfs)
+
+
+def test_analyze_demo_mode_skips_retrieval(tmp_path):
+    result = _import_main(tmp_path, demo=True, code="\n".join([
+        "import asyncio, json, types",
+        "reply = {'intent_detected': 'RTI', 'kill_switch_triggered': False,",
+        "         'simplified_explanation': 'x', 'relevant_acts': [], 'immediate_action_steps': [],",
+        "         'extracted_user_issue': 'y', 'follow_up_question': ''}",
+        "async def create(**kwargs):",
+        "    message = types.SimpleNamespace(content=json.dumps(reply))",
+        "    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])",
+        "main.groq_client = types.SimpleNamespace(",
+        "    chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))",
+        "out = asyncio.run(main.analyze(main.AnalyzeRequest(text='I want my land records')))",
+        "assert out.intent_detected == 'RTI' and out.context_source == 'RAG', out",
+    ]))
+    assert result.returncode == 0, result.stderr
@@ -6,19 +6,30 @@ All URLs verified working (HTTP 200, meaningful content).
 Falls back gracefully (returns empty string) on any network/parse error.
 
 Priority order per intent:
-  - URLs are tried concurrently; up to 2 successes are fused as primary context.
-  - If ALL fail → caller falls back to ChromaDB RAG automatically.
-
-Caching: Successful responses cached for CACHE_TTL seconds (1 hour).
+  - URLs are tried concurrently; the first 2 to succeed are fused as primary context.
+  - If ALL fail → caller falls back to local RAG (numpy cosine over the legal chunks).
+
+Caching: Successful responses cached for CACHE_TTL seconds (1 hour), LRU-
+bounded to CACHE_SIZE URLs; concurrent misses for a URL share one download.
+The extracted text is mirrored to CACHE_PATH and reloaded on start-up; writes
+are batched off the event loop, at most one per CACHE_FLUSH_DELAY seconds,
+and flush_cache() writes what is pending at shutdown.
+Connections: pass one long-lived make_client() to fetch_government_context
+so keep-alive connections to the portals are reused across requests.
 """
 
 import asyncio
+import os
 import time
 import logging
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
 import httpx
-from bs4 import BeautifulSoup
+import orjson
+from selectolax.lexbor import LexborHTMLParser
 
 logger = logging.getLogger("nyaya.web_fetcher")
 
@@ -26,12 +37,22 @@ logger = logging.getLogger("nyaya.web_fetcher")
         
                                                                              
 
-_cache: dict[str, tuple[str, float]] = {}
+# url -> (extracted text, fetched-at); LRU-ordered, bounded by CACHE_SIZE.
+_cache: OrderedDict[str, tuple[str, float]] = OrderedDict()
+# url -> download in progress, shared by every caller that misses meanwhile.
+_inflight: dict[str, asyncio.Task] = {}
 CACHE_TTL: int = 3600                   
+CACHE_SIZE: int = 256
+CACHE_PATH: Path = Path(__file__).parent / "web_cache.json"
+CACHE_FLUSH_DELAY: float = 5.0
 MIN_CONTENT_LEN: int = 100                                                 
 MAX_PARAGRAPHS: int = 50                                            
 MAX_CHARS_PER_SOURCE: int = 3500
+MAX_HTML_BYTES: int = 512 * 1024
 FETCH_TIMEOUT: float = 7.0
+MAX_CONNECTIONS: int = 64
+MAX_KEEPALIVE: int = 32
+KEEPALIVE_EXPIRY: float = 60.0
 
                                                                              
                                                                               
@@ -102,34 +123,40 @@ _HEADERS = {
                                                                              
 
 
+_NOISE_SELECTOR = (
+    "script, style, nav, footer, header, noscript, aside, "
+    "form, button, iframe, meta, link, img, figure"
+)
+# Tried in order; the first match is taken as the page's main content,
+# falling back to <body>.
+_MAIN_SELECTORS = (
+    "main", "article", "#content", "#main-content",
+    ".content", ".main-content", ".node__content",
+)
+_TEXT_SELECTOR = "p, li, h1, h2, h3, h4, td, dd"
+
+
 def _extract_text(html: str) -> str:
     """Parse HTML, strip noise tags, return clean paragraph text."""
-    soup = BeautifulSoup(html, "lxml")
-
-                  
-    for tag in soup(["script", "style", "nav", "footer", "header",
-                     "noscript", "aside", "form", "button", "iframe",
-                     "meta", "link", "img", "figure"]):
-        tag.decompose()
-
-                                    
-    main = (
-        soup.find("main")
-        or soup.find("article")
-        or soup.find(id="content")
-        or soup.find(id="main-content")
-        or soup.find(class_="content")
-        or soup.find(class_="main-content")
-        or soup.find(class_="node__content")
-        or soup.find("body")
-    )
-    if not main:
-        return ""
+    tree = LexborHTMLParser(html)
+    # One selector pass finds every noise element (strip_tags would walk the
+    # tree once per tag). Removed last-first, so a nested match is always
+    # destroyed before the ancestor that contains it.
+    for node in reversed(tree.css(_NOISE_SELECTOR)):
+        node.decompose()
+
+    for selector in _MAIN_SELECTORS:
+        main = tree.css_first(selector)
+        if main is not None:
+            break
+    else:
+        main = tree.body
+        if main is None:
+            return ""
 
     texts: list[str] = []
-    for tag in main.find_all(["p", "li", "h1", "h2", "h3", "h4", "td", "dd"]):
-        t = tag.get_text(separator=" ", strip=True)
-                                                               
+    for node in main.css(_TEXT_SELECTOR):
+        t = node.text(separator=" ", strip=True)
         if len(t) > 40 and not t.startswith("Skip to"):
             texts.append(t)
         if len(texts) >= MAX_PARAGRAPHS:
@@ -143,34 +170,133 @@ def _extract_text(html: str) -> str:
                                                                              
 
 
+def _load_cache() -> None:
+    """Seed _cache from CACHE_PATH so a restart does not re-fetch warm portals."""
+    try:
+        entries = orjson.loads(CACHE_PATH.read_bytes())
+        now = time.time()
+        for url, (text, ts) in sorted(entries.items(), key=lambda kv: kv[1][1])[-CACHE_SIZE:]:
+            if now - ts < CACHE_TTL:
+                _cache[url] = (text, ts)
+    except (OSError, ValueError, TypeError):
+        return
+
+
+def _save_cache(entries: dict[str, tuple[str, float]]) -> None:
+    """Write entries to CACHE_PATH atomically; skipped on a read-only disk."""
+    tmp_path = CACHE_PATH.with_name(f"{CACHE_PATH.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(orjson.dumps(entries))
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        pass
+
+
+_load_cache()
+
+_cache_dirty = False
+_flush_task: Optional[asyncio.Task] = None
+_write_lock = asyncio.Lock()
+
+
+def _mark_dirty() -> None:
+    """Note a cache change; the first one starts the delayed background flush."""
+    global _cache_dirty, _flush_task
+    _cache_dirty = True
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.create_task(_flush_later())
+
+
+async def _write_cache() -> None:
+    global _cache_dirty
+    async with _write_lock:
+        if not _cache_dirty:
+            return
+        _cache_dirty = False
+        # Snapshot on the loop; serialising and writing happen in a thread.
+        await asyncio.to_thread(_save_cache, dict(_cache))
+
+
+async def _flush_later() -> None:
+    # Downloads landing within one delay share a single write.
+    while _cache_dirty:
+        await asyncio.sleep(CACHE_FLUSH_DELAY)
+        # Shielded so cancelling the flusher never abandons a write half-way;
+        # flush_cache() then queues behind it on _write_lock.
+        await asyncio.shield(_write_cache())
+
+
+async def flush_cache() -> None:
+    """Write any pending cache changes to CACHE_PATH now, e.g. at shutdown."""
+    if _flush_task is not None:
+        _flush_task.cancel()
+        await asyncio.gather(_flush_task, return_exceptions=True)
+    await _write_cache()
+
+
+# One URL can carry a different label per intent (e.g. cic.gov.in), so the
+# cache holds bare text and the labelled block is memoized per (label, text);
+# a cache hit then returns the same string object instead of rebuilding it.
+@lru_cache(maxsize=2 * CACHE_SIZE)
+def _labelled(label: str, text: str) -> str:
+    return f"[Source: {label}]\n{text}"
+
+
 async def _fetch_one(client: httpx.AsyncClient, source: dict) -> Optional[str]:
     """Fetch one URL. Returns formatted text or None on failure."""
     url = source["url"]
     label = source["label"]
 
-               
-    if url in _cache:
-        text, ts = _cache[url]
+    cached = _cache.get(url)
+    if cached is not None:
+        text, ts = cached
         if time.time() - ts < CACHE_TTL:
+            _cache.move_to_end(url)
             logger.info("Cache hit: %s (%d chars)", url, len(text))
-            return f"[Source: {label}]\n{text}"
-
+            return _labelled(label, text)
+        del _cache[url]
+
+    # Single-flight: concurrent misses for one URL share a download. Shielded
+    # so a caller that stops waiting does not cancel it for the others.
+    task = _inflight.get(url)
+    if task is None:
+        task = asyncio.create_task(_download(client, url))
+        _inflight[url] = task
+        task.add_done_callback(lambda _: _inflight.pop(url, None))
+    text = await asyncio.shield(task)
+    return _labelled(label, text) if text else None
+
+
+async def _download(client: httpx.AsyncClient, url: str) -> Optional[str]:
+    """GET and extract one URL, caching the text. None on any failure."""
     try:
         logger.info("Fetching: %s", url)
-        resp = await client.get(url, headers=_HEADERS)
-        if resp.status_code != 200:
-            logger.warning("HTTP %d: %s", resp.status_code, url)
-            return None
-
-        text = _extract_text(resp.text)
+        # Only the head of a page yields the kept paragraphs; stop reading at
+        # MAX_HTML_BYTES instead of downloading and parsing all of it.
+        async with client.stream("GET", url) as resp:
+            if resp.status_code != 200:
+                logger.warning("HTTP %d: %s", resp.status_code, url)
+                return None
+            body = bytearray()
+            async for chunk in resp.aiter_bytes():
+                body += chunk
+                if len(body) >= MAX_HTML_BYTES:
+                    break
+            html = body.decode(resp.encoding or "utf-8", errors="replace")
+
+        # Parsing is CPU work; keep it off the event loop.
+        text = await asyncio.to_thread(_extract_text, html)
         if len(text) < MIN_CONTENT_LEN:
             logger.warning("Too short (%d chars): %s", len(text), url)
             return None
 
         text = text[:MAX_CHARS_PER_SOURCE]
         _cache[url] = (text, time.time())
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+        _mark_dirty()
         logger.info("OK — %d chars from %s", len(text), url)
-        return f"[Source: {label}]\n{text}"
+        return text
 
     except (httpx.TimeoutException, httpx.NetworkError) as exc:
         logger.warning("Network error for %s: %s", url, exc)
@@ -185,9 +311,32 @@ async def _fetch_one(client: httpx.AsyncClient, source: dict) -> Optional[str]:
                                                                              
 
 
-async def fetch_government_context(intent: str) -> tuple[str, list[str]]:
+def make_client() -> httpx.AsyncClient:
+    """
+    Connection-pooled client for the portal fetches; the caller closes it.
+    HTTP/2 (where a portal offers it) multiplexes the concurrent fetches to
+    one host, e.g. cic.gov.in or nalsa.gov.in, over a single connection.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(FETCH_TIMEOUT),
+        follow_redirects=True,
+        headers=_HEADERS,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+async def fetch_government_context(
+    intent: str,
+    client: Optional[httpx.AsyncClient] = None,
+) -> tuple[str, list[str]]:
     """
     Fetch live legal content from official government portals for the given intent.
+    Uses `client` when given (shared pool); otherwise opens a one-off client.
 
     Returns:
         (combined_text, sources_used)
@@ -197,27 +346,51 @@ async def fetch_government_context(intent: str) -> tuple[str, list[str]]:
     if not sources:
         return "", []
 
-    combined: list[str] = []
-    sources_used: list[str] = []
-
-    async with httpx.AsyncClient(
-        timeout=httpx.Timeout(FETCH_TIMEOUT),
-        follow_redirects=True,
-    ) as client:
-                                            
-        tasks = [_fetch_one(client, src) for src in sources[:3]]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for src, result in zip(sources[:3], results):
-            if isinstance(result, str) and result:
-                combined.append(result)
-                sources_used.append(src["label"])
-            if len(combined) >= 2:
-                break
+    if client is None:
+        async with make_client() as client:
+            return await fetch_government_context(intent, client)
+
+    # All fetches start together; the call returns as soon as any two have
+    # succeeded and stops waiting for the straggler, so one slow portal no
+    # longer holds up the answer until its timeout. On a shared client the
+    # straggler's download runs on and fills the cache; a one-off client is
+    # closed on return, so there it just fails. Winners are still fused in
+    # priority order.
+    tasks = {
+        asyncio.create_task(_fetch_one(client, src)): i
+        for i, src in enumerate(sources[:3])
+    }
+    texts: dict[int, str] = {}
+    pending = set(tasks)
+    try:
+        while pending and len(texts) < 2:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.result():
+                    texts[tasks[task]] = task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    ranks = sorted(texts)[:2]
+    combined = [texts[i] for i in ranks]
+    sources_used = [sources[i]["label"] for i in ranks]
 
     return "\n\n---\n\n".join(combined), sources_used
 
 
+async def warm_up(client: httpx.AsyncClient) -> None:
+    """
+    Fetch every configured source once, e.g. in the background at start-up.
+    This resolves each portal's DNS, opens its keep-alive connection and
+    fills the text cache before the first user asks; URLs still cached from
+    a previous run are skipped by _fetch_one.
+    """
+    unique = {src["url"]: src for srcs in GOVERNMENT_SOURCES.values() for src in srcs}
+    await asyncio.gather(*(_fetch_one(client, src) for src in unique.values()))
+
+
 def get_available_sources(intent: str) -> list[str]:
     """Return all configured source URLs for a given intent."""
     return [s["url"] for s in GOVERNMENT_SOURCES.get(intent, [])]